@@ -17,7 +17,20 @@
 # import src.nc4.surf_meas
 # import src.ml_mlp  # noqa
 
-from .experiment import load  # noqa
+import importlib
+from typing import Any
+
 from .config import config_paths  # noqa
 # from .ml_mlp import MLP_Model, MLP_Win_Model, LSTM_Model, Linear_Model # noqa
 # from .nc4.surf_meas import SurfMeasurements  # noqa
+
+
+def __getattr__(name: str) -> Any:
+    # experiment pulls in matplotlib and all of the AE/NC4 stack, so only
+    # import it when used, keeping quick tools like nc4-runout.py fast
+    if name not in ('load', 'experiment', 'ae', 'nc4', 'probe'):
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    experiment = importlib.import_module('.experiment', __name__)
+    if name == 'load':
+        return experiment.load
+    return globals()[name]
@@ -15,6 +15,7 @@ os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 import multiprocessing
 import os
 from functools import partial
+from itertools import chain, zip_longest
 from pathlib import PurePosixPath as Path
 from typing import List, Tuple, Any, Union
 
@@ -23,8 +24,6 @@ import mplcursors
 import numpy as np
 import pandas as pd
 from nptdms import TdmsFile
-from scipy.stats import kurtosis
-from scipy.stats import skew
 from tqdm import tqdm
 from scipy.signal import hilbert, butter, filtfilt
 import tkinter as tk
@@ -32,16 +31,26 @@ import glob
 import re
 
 from .. import config
+from .cache import SampleCache, envelope_cache, sample_cache, spectrum_cache
+from .lod import LODLine, minmax_blocks
+from .rms_store import RMSStore
+from .spectrum import Spectrum
 
 
 HOME_DIR, BASE_DIR, CODE_DIR, TB_DIR, RMS_DATA_DIR = config.config_paths()
 
+# samples per block of the cached min/max envelope used for plotting
+ENVELOPE_BLOCK = 1_000
+# decimation of the filtered envelope in the fast trigger mode
+FAST_TRIG_DEC = 1_000
+
 
 def butter_filter(
         data: np.ndarray,
         ftype: str = 'low',
         fs: float = 2_000_000,
         order: int = 3,
+        pad: int = 10_000,
 ) -> np.ndarray:
     """
         Apply butterworth filter to input data.
@@ -51,12 +60,13 @@ def butter_filter(
         ftype: Type of filter, (low, high, band)
         fs: Sample freq for the input signal
         order: Filter order
+        pad: Number of zeros to pad either end of the signal with
 
     Returns:
         Filtered signal
 
     """
-    data = np.pad(data, pad_width=10_000)
+    data = np.pad(data, pad_width=pad)
     b, a = butter(N=order,
                   Wn=10,
                   fs=fs,
@@ -65,7 +75,126 @@ def butter_filter(
                   output='ba'
                   )
     y = filtfilt(b, a, data)
-    return y[10_000:-10_000]
+    return y[pad:-pad]
+
+
+def read_tdms_window(
+        filepath: Union[str, Path],
+        start: Union[int, None] = None,
+        stop: Union[int, None] = None,
+        step: int = 1,
+        chunk_size: int = 2_000_000,
+) -> Tuple[np.ndarray, dict]:
+    """
+    Lazily read a window of raw samples from a single channel TDMS file.
+
+    The file is opened in streaming mode so only the segments covering the\
+        requested window are read from disk. Start and stop follow python\
+        slice semantics, including negative indices.
+
+    Args:
+        filepath: Path to the TDMS file.
+        start: Index of the first sample to read.
+        stop: Index after the last sample to read.
+        step: Decimation stride between returned samples.
+        chunk_size: Number of samples read at a time when decimating.
+
+    Returns:
+        A tuple of the raw (unscaled) samples and the file properties.
+    """
+    if step < 1:
+        raise ValueError('Decimation step must be a positive integer')
+    with TdmsFile.open(filepath) as tdms:
+        prop = dict(tdms.properties)
+        channel = tdms.groups()[-1].channels()[-1]
+        start, stop, _ = slice(start, stop).indices(len(channel))
+        length = max(stop - start, 0)
+        if step == 1:
+            return channel.read_data(offset=start, length=length), prop
+
+        data = np.empty(-(-length // step), dtype=channel.dtype)
+        chunk_size = max(chunk_size // step, 1) * step
+        for pos in range(0, length, chunk_size):
+            n = min(chunk_size, length - pos)
+            chunk = channel.read_data(offset=start + pos, length=n)
+            data[pos // step:(pos + n - 1) // step + 1] = chunk[::step]
+    return data, prop
+
+
+def _cached_samples(
+        cache: SampleCache,
+        filepath: Union[str, Path],
+        fs: Union[float, None] = None,
+        chunk_size: int = 4_000_000,
+) -> Union[Tuple[np.memmap, dict], None]:
+    """
+    Get the cached samples of a TDMS file, building the entry on first touch.
+
+    Args:
+        cache: Sample cache to read from/write to.
+        filepath: Path to the TDMS file.
+        fs: Sample rate of the signal, stored in the sidecar.
+        chunk_size: Number of samples copied at a time when building.
+
+    Returns:
+        Tuple of the memory-mapped raw samples and the sidecar metadata, or\
+            None if the entry was evicted as soon as it was written.
+    """
+    entry = cache.get(filepath)
+    if entry is not None:
+        return entry
+    with TdmsFile.open(filepath) as tdms:
+        prop = tdms.properties
+        channel = tdms.groups()[-1].channels()[-1]
+        n = len(channel)
+        chunks = (channel.read_data(offset=i, length=min(chunk_size, n - i))
+                  for i in range(0, n, chunk_size))
+        return cache.put(filepath,
+                         chunks,
+                         channel.dtype,
+                         n,
+                         {'gain': prop.get('Gain'),
+                          'offset': prop.get('Offset'),
+                          'fs': fs,
+                          },
+                         )
+
+
+def read_ae_window(
+        filepath: Union[str, Path],
+        start: Union[int, None] = None,
+        stop: Union[int, None] = None,
+        step: int = 1,
+        fs: Union[float, None] = None,
+) -> Tuple[np.ndarray, dict]:
+    """
+    Read a window of raw AE samples, through the local sample cache if enabled.
+
+    With a cache configured (see `config.cache_config`) the first read of a\
+        file copies its samples into the cache and every read maps the\
+        cached file, otherwise the window is read straight from the TDMS.
+
+    Args:
+        filepath: Path to the TDMS file.
+        start: Index of the first sample to read.
+        stop: Index after the last sample to read.
+        step: Decimation stride between returned samples.
+        fs: Sample rate of the signal, stored with new cache entries.
+
+    Returns:
+        A tuple of the raw (unscaled) samples and the file properties.
+    """
+    cache = sample_cache()
+    if cache is None:
+        return read_tdms_window(filepath, start, stop, step)
+    if step < 1:
+        raise ValueError('Decimation step must be a positive integer')
+    entry = _cached_samples(cache, filepath, fs)
+    if entry is None:
+        return read_tdms_window(filepath, start, stop, step)
+    data, meta = entry
+    prop = {'Gain': meta['gain'], 'Offset': meta['offset']}
+    return data[start:stop:step], prop
 
 
 def rms(x: np.ndarray) -> np.ndarray:
@@ -98,6 +227,55 @@ def envelope_hilbert(s: Union[np.ndarray, list]) -> np.ndarray:
     return inst_amp
 
 
+def envelope_blocks(sig: 'AESignal', block: int = 1_000) -> np.ndarray:
+    """
+    Approximate the hilbert envelope of a signal at a decimated rate.
+
+    Uses the mean absolute value over each block scaled by pi/2, which equals\
+        the mean hilbert amplitude for both a sinusoid and gaussian noise. The\
+        block mean acts as the anti-aliasing filter for the decimation.
+
+    Args:
+        sig: AE signal to envelope.
+        block: Number of samples averaged into each envelope sample.
+
+    Returns:
+        Envelope of the signal with one sample per block.
+    """
+    n = len(sig)
+    env = np.empty(-(-n // block))
+    step = max(sig.chunk_size // block, 1) * block
+    for i in range(0, n, step):
+        c = np.abs(sig[i:i + step].to_volts())
+        k = len(c) // block
+        o = i // block
+        env[o:o + k] = c[:k * block].reshape(k, block).mean(axis=1)
+        if len(c) % block:
+            env[o + k] = c[k * block:].mean()
+    env *= np.pi / 2
+    return env
+
+
+def _chunk_bounds(n: int, chunk_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    First and last index of each chunk, matching np.array_split into\
+        int(n / chunk_size) sections.
+
+    Args:
+        n: Length of the data.
+        chunk_size: Nominal size of the chunks.
+
+    Returns:
+        Arrays of the start and end (inclusive) index of each chunk.
+    """
+    n_chunks = max(int(n / chunk_size), 1)
+    size, extra = divmod(n, n_chunks)
+    i = np.arange(n_chunks)
+    starts = i * size + np.minimum(i, extra)
+    ends = starts + size - 1 + (i < extra)
+    return starts, ends
+
+
 def trigger_st(
         d: Union[np.ndarray, list],
         chunk_size: int = 100_000,
@@ -118,28 +296,526 @@ def trigger_st(
         [t, t_y]: Trigger index, Data value at trigger point
 
     """
-    n_chunks = len(d) / chunk_size
-
-    chunks = np.array_split(d, n_chunks)
-    grad = [(chunki[-1] - chunki[0]) / chunk_size for chunki in chunks]
-    if np.max(grad) < diff_change:
-        t = None
-        t_y = None
-    else:
-        ind = [(i * chunk_size) + (chunk_size / 2) for i in range(len(grad))]
-        zipped = tuple(zip(ind, np.abs(grad)))
-        trig = sorted([z for z in zipped if z[1] >= diff_change],
-                      key=lambda x: x[0],
-                      reverse=False
-                      )
-
-        t = (trig[0][0])
-        t_y = d[int(t)]
-        # t[1] = int(t[0]) + np.argmax(d[int(t[0]):] < t_y)
-        # assert t[1] - t[0] > 35_000_000, 'Trigger point selection incorrect'
+    d = np.asarray(d)
+    t, t_y = trigger_st_batch(d[np.newaxis, :], chunk_size, diff_change)
+    if np.isnan(t[0]):
+        return None, None
+    return t[0], t_y[0]
+
+
+def trigger_st_batch(
+        d: np.ndarray,
+        chunk_size: int = 100_000,
+        diff_change: float = 1.75E-6,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the first trigger point of each row of a stack of filtered envelopes.
+
+    Batched version of `trigger_st`, the gradient of every chunk is taken from\
+        the chunk end points and the trigger is the first chunk whose absolute\
+        gradient crosses `diff_change`, for rows whose max gradient does.
+
+    Args:
+        d: 2D array of data to find triggers of, one row per file.
+        chunk_size: Size of chunks to calculate gradient over.
+        diff_change: Threshold for change in gradient to find trigger.
+
+    Returns:
+        Arrays of the trigger index and data value at that point for each\
+            row, NaN where a row has no trigger.
+    """
+    d = np.atleast_2d(d)
+    starts, ends = _chunk_bounds(d.shape[1], chunk_size)
+    grad = (d[:, ends] - d[:, starts]) / chunk_size
+    crossed = np.abs(grad) >= diff_change
+    found = grad.max(axis=1) >= diff_change
+
+    first = np.argmax(crossed, axis=1)
+    t = first * chunk_size + chunk_size / 2
+    rows = np.flatnonzero(found)
+    t_y = np.full(len(d), np.nan)
+    t_y[rows] = d[rows, t[rows].astype(int)]
+    t = np.where(found, t, np.nan)
     return t, t_y
 
 
+def pre_amp_factor(gain: float) -> float:
+    """
+    Factor to scale AE voltages by to normalise them to a 40 dB pre-amp gain.
+
+    Args:
+        gain: Gain setting of the pre-amp. (dB)
+
+    Returns:
+        Multiplier to apply to the voltage signal.
+    """
+    if gain == 20:
+        return 10.0
+    elif gain == 60:
+        return 0.1
+    return 1.0
+
+
+class Moments:
+    def __init__(self) -> None:
+        """
+        Streaming accumulator for the moments of a signal.
+
+        Holds the count, mean, central sums M2, M3 and M4, max and min of all\
+            the samples seen so far. Chunks are added with `update` and\
+            accumulators from separate chunks, processes or threads are\
+            combined with `merge`, using the pairwise update formulas of\
+            Pebay (2008), so no full length temporaries are needed.
+        """
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.max = -np.inf
+        self.min = np.inf
+
+    @classmethod
+    def from_array(cls, x: np.ndarray) -> 'Moments':
+        """
+        Moments of a single chunk, calculated about the chunk mean.
+
+        Args:
+            x: Chunk of the signal.
+
+        Returns:
+            Accumulator holding the moments of the chunk.
+        """
+        m = cls()
+        if len(x) == 0:
+            return m
+        x = np.asarray(x, dtype=np.float64)
+        m.n = len(x)
+        m.mean = float(x.mean())
+        d = x - m.mean
+        d2 = d * d
+        m.m2 = float(d2.sum())
+        m.m3 = float(np.dot(d2, d))
+        m.m4 = float(np.dot(d2, d2))
+        m.max = float(x.max())
+        m.min = float(x.min())
+        return m
+
+    def update(self, x: np.ndarray) -> 'Moments':
+        """
+        Add a chunk of samples to the accumulator.
+
+        Args:
+            x: Chunk of the signal.
+
+        Returns:
+            The updated accumulator.
+        """
+        return self.merge(Moments.from_array(x))
+
+    def merge(self, other: 'Moments') -> 'Moments':
+        """
+        Combine the moments of another accumulator into this one.
+
+        Args:
+            other: Accumulator of a separate set of samples.
+
+        Returns:
+            The updated accumulator.
+        """
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        d_n = delta / n
+        m2 = self.m2 + other.m2 + delta * d_n * na * nb
+        m3 = (self.m3 + other.m3
+              + delta * d_n ** 2 * na * nb * (na - nb)
+              + 3 * d_n * (na * other.m2 - nb * self.m2))
+        m4 = (self.m4 + other.m4
+              + delta * d_n ** 3 * na * nb * (na * na - na * nb + nb * nb)
+              + 6 * d_n ** 2 * (na * na * other.m2 + nb * nb * self.m2)
+              + 4 * d_n * (na * other.m3 - nb * self.m3))
+        self.n = n
+        self.mean += d_n * nb
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.max = max(self.max, other.max)
+        self.min = min(self.min, other.min)
+        return self
+
+    def __add__(self, other: 'Moments') -> 'Moments':
+        return Moments().merge(self).merge(other)
+
+    def scaled(self, scale: float, offset: float = 0.0) -> 'Moments':
+        """
+        Moments of the linearly transformed signal `x * scale + offset`.
+
+        Args:
+            scale: Multiplier applied to the samples.
+            offset: Offset added after scaling.
+
+        Returns:
+            New accumulator for the transformed signal.
+        """
+        m = Moments()
+        m.n = self.n
+        m.mean = self.mean * scale + offset
+        m.m2 = self.m2 * scale ** 2
+        m.m3 = self.m3 * scale ** 3
+        m.m4 = self.m4 * scale ** 4
+        lims = (self.max * scale + offset, self.min * scale + offset)
+        m.max, m.min = max(lims), min(lims)
+        return m
+
+    @property
+    def var(self) -> float:
+        """Biased variance."""
+        return self.m2 / self.n
+
+    @property
+    def rms(self) -> float:
+        return np.sqrt(self.m2 / self.n + self.mean ** 2)
+
+    @property
+    def skew(self) -> float:
+        """Biased skewness, matching scipy.stats.skew."""
+        if self.m2 <= 0:
+            return np.nan
+        return self.m3 / self.n / (self.m2 / self.n) ** 1.5
+
+    @property
+    def kurtosis(self) -> float:
+        """Pearson kurtosis, matching scipy.stats.kurtosis(fisher=False)."""
+        if self.m2 <= 0:
+            return np.nan
+        return self.m4 / self.n / (self.m2 / self.n) ** 2
+
+
+class AESignal:
+    def __init__(
+            self,
+            raw: np.ndarray,
+            scale: float = 1.0,
+            offset: float = 0.0,
+            chunk_size: int = 1_000_000,
+    ) -> None:
+        """
+        AE signal held as raw acquisition samples with a deferred scaling.
+
+        The voltage signal is `raw * scale + offset`. Reductions are computed\
+            from the raw buffer, either analytically or chunk by chunk, so a\
+            full length float64 copy is only made by `to_volts`.
+
+        Args:
+            raw: Raw samples from the TDMS file, (usually int16/int32).
+            scale: Multiplier converting raw samples to volts.
+            offset: Offset added after scaling, in volts.
+            chunk_size: Number of samples converted at a time in reductions.
+        """
+        self.raw = raw
+        self.scale = scale
+        self.offset = offset
+        self.chunk_size = chunk_size
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __getitem__(self, item: slice) -> 'AESignal':
+        if not isinstance(item, slice):
+            raise TypeError('AESignal only supports slice indexing')
+        return AESignal(self.raw[item], self.scale, self.offset,
+                        self.chunk_size)
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        return self.to_volts(np.float64 if dtype is None else dtype)
+
+    @property
+    def nbytes(self) -> int:
+        return self.raw.nbytes
+
+    def to_volts(self, dtype: Any = np.float64) -> np.ndarray:
+        """
+        Convert the whole signal to volts.
+
+        Args:
+            dtype: Float type of the returned array.
+
+        Returns:
+            Scaled voltage signal.
+        """
+        v = self.raw.astype(dtype)
+        v *= self.scale
+        v += self.offset
+        return v
+
+    def chunks(self) -> Any:
+        """
+        Iterate over the signal in volts, one float64 chunk at a time.
+
+        Yields:
+            Scaled chunk of the signal.
+        """
+        for i in range(0, len(self.raw), self.chunk_size):
+            c = self.raw[i:i + self.chunk_size].astype(np.float64)
+            c *= self.scale
+            c += self.offset
+            yield c
+
+    def _raw_sum(self) -> float:
+        if np.issubdtype(self.raw.dtype, np.integer):
+            return float(self.raw.sum(dtype=np.int64))
+        return float(self.raw.sum(dtype=np.float64))
+
+    def max(self) -> float:
+        r = self.raw.max() if self.scale >= 0 else self.raw.min()
+        return float(r) * self.scale + self.offset
+
+    def min(self) -> float:
+        r = self.raw.min() if self.scale >= 0 else self.raw.max()
+        return float(r) * self.scale + self.offset
+
+    def mean(self) -> float:
+        return self._raw_sum() / len(self.raw) * self.scale + self.offset
+
+    def moments(self) -> Moments:
+        """
+        Moments of the signal from a single chunked pass over the raw samples.
+
+        The accumulator runs on the unscaled samples and the scaling is\
+            applied analytically to the result.
+
+        Returns:
+            Accumulator holding the moments of the signal in volts.
+        """
+        m = Moments()
+        for i in range(0, len(self.raw), self.chunk_size):
+            m.update(self.raw[i:i + self.chunk_size])
+        return m.scaled(self.scale, self.offset)
+
+    def rms(self) -> float:
+        return self.moments().rms
+
+    def kurtosis(self) -> float:
+        """Pearson kurtosis, matching scipy.stats.kurtosis(fisher=False)."""
+        return self.moments().kurtosis
+
+    def skew(self) -> float:
+        """Biased skewness, matching scipy.stats.skew."""
+        return self.moments().skew
+
+    def rolling_rms(
+            self,
+            window: int,
+            block: int = 1,
+            chunk_size: Union[int, None] = None,
+    ) -> np.ndarray:
+        """
+        RMS over a rolling window, optionally averaged into blocks.
+
+        Matches `pd.Series(v).pow(2).rolling(window).mean() ** 0.5` with the\
+            leading NaNs dropped, so output `i` is the RMS of samples `i` to\
+            `i + window - 1`. The window sums of the raw samples and their\
+            squares come from prefix sums restarted every chunk. These are\
+            exact int64 sums for 8/16 bit samples, otherwise float64 sums of\
+            the volts, whose rounding error is bounded by the chunk rather\
+            than the signal length. Each chunk of output is averaged into\
+            blocks straight away, so no full length temporaries are made.
+
+        Args:
+            window: Number of samples in the rolling window.
+            block: Number of outputs averaged into each returned value, the\
+                last block is averaged over the outputs available.
+            chunk_size: Number of outputs calculated at a time, rounded to a\
+                multiple of `block`, default the larger of `self.chunk_size`\
+                and 4 windows so the window overlap is re-read at most 25%.
+
+        Returns:
+            Rolling RMS, `len(self) - window + 1` values, or one per block.
+        """
+        n_out = len(self.raw) - window + 1
+        if n_out < 1:
+            return np.empty(0)
+        if chunk_size is None:
+            chunk_size = max(self.chunk_size, 4 * window)
+        step = max(chunk_size // block, 1) * block
+        exact = (np.issubdtype(self.raw.dtype, np.integer)
+                 and self.raw.dtype.itemsize <= 2)
+        out = np.empty(-(-n_out // block))
+        for i in range(0, n_out, step):
+            m = min(step, n_out - i)
+            c = self.raw[i:i + m + window - 1]
+            if exact:
+                c = c.astype(np.int64)
+            else:
+                c = c.astype(np.float64)
+                c *= self.scale
+                c += self.offset
+            s1 = np.zeros(len(c) + 1, dtype=c.dtype)
+            s2 = np.zeros(len(c) + 1, dtype=c.dtype)
+            np.cumsum(c, out=s1[1:])
+            np.cumsum(c * c, out=s2[1:])
+            ms = (s2[window:] - s2[:-window]).astype(np.float64)
+            ms /= window
+            if exact:
+                # mean of (raw * scale + offset) ** 2 from the raw sums
+                m1 = (s1[window:] - s1[:-window]) / window
+                ms *= self.scale ** 2
+                ms += m1 * (2 * self.scale * self.offset) + self.offset ** 2
+            np.maximum(ms, 0, out=ms)
+            np.sqrt(ms, out=ms)
+
+            if block == 1:
+                out[i:i + m] = ms
+                continue
+            k = m // block
+            o = i // block
+            out[o:o + k] = ms[:k * block].reshape(k, block).mean(axis=1)
+            if m % block:
+                out[o + k] = ms[k * block:].mean()
+        return out
+
+    def block_rms(
+            self,
+            blocks: Tuple[int, ...] = (10_000, 100_000, 1_000_000),
+    ) -> List[np.ndarray]:
+        """
+        RMS of consecutive blocks of the signal, at several block sizes.
+
+        The sums of squares of the smallest blocks are found in one chunked\
+            pass, from exact int64 sums of the raw samples for 8/16 bit\
+            data, and each larger size is aggregated from them. The last\
+            block of each size is the RMS of the samples available.
+
+        Args:
+            blocks: Block sizes in samples, each a multiple of the first.
+
+        Returns:
+            RMS of each block, one array per block size.
+        """
+        base = blocks[0]
+        if any(b % base for b in blocks):
+            raise ValueError(f'Block sizes {blocks} must be multiples of '
+                             f'{base}.')
+        n = len(self.raw)
+        exact = (np.issubdtype(self.raw.dtype, np.integer)
+                 and self.raw.dtype.itemsize <= 2)
+        sq = np.empty(-(-n // base))
+        step = max(self.chunk_size // base, 1) * base
+        for i in range(0, n, step):
+            c = self.raw[i:i + step]
+            idx = np.arange(0, len(c), base)
+            o = i // base
+            if exact:
+                c = c.astype(np.int64)
+                s1 = np.add.reduceat(c, idx)
+                s2 = np.add.reduceat(c * c, idx)
+                count = np.diff(np.append(idx, len(c)))
+                # sum of (raw * scale + offset) ** 2 from the raw sums
+                sq[o:o + len(idx)] = (s2 * self.scale ** 2
+                                      + s1 * (2 * self.scale * self.offset)
+                                      + count * self.offset ** 2)
+            else:
+                c = c.astype(np.float64)
+                c *= self.scale
+                c += self.offset
+                sq[o:o + len(idx)] = np.add.reduceat(c * c, idx)
+
+        out = []
+        for b in blocks:
+            idx = np.arange(0, len(sq), b // base)
+            count = np.diff(np.append(idx * base, n))
+            ms = np.add.reduceat(sq, idx) / count
+            out.append(np.sqrt(np.maximum(ms, 0)))
+        return out
+
+    def fft_mean(self, length: int, blocks: int = 64) -> np.ndarray:
+        """
+        Single sided amplitude spectrum averaged over Hann windowed blocks.
+
+        Blocks are scaled and transformed a group at a time, with the final\
+            block zero padded in volts, matching the original whole-signal\
+            calculation.
+
+        Args:
+            length: Number of samples in each fft block.
+            blocks: Number of blocks to transform at a time.
+
+        Returns:
+            Mean amplitude spectrum with `length // 2` bins.
+        """
+        win = np.hanning(length)
+        sc = len(win) / sum(win)
+        n_blocks = -(-len(self.raw) // length)
+        total = np.zeros(length // 2)
+        step = blocks * length
+        for i in range(0, len(self.raw), step):
+            c = self.raw[i:i + step].astype(np.float64)
+            c *= self.scale
+            c += self.offset
+            if len(c) % length:
+                c = np.pad(c, (0, length - len(c) % length))
+            c = c.reshape(-1, length)
+            c *= win
+            p = np.abs(np.fft.rfft(c, n=length, axis=1)[:, :length // 2])
+            total += p.sum(axis=0)
+        total /= length
+        total[1:] *= 2
+        return total * sc / n_blocks
+
+
+def aggregate_spectrum(p: np.ndarray, factor: int) -> np.ndarray:
+    """
+    Derive a coarser resolution amplitude spectrum from a finer one.
+
+    Each coarse bin is the root-sum-square of the `factor` fine bins centred\
+        on it, so the broadband energy is kept. The result is an\
+        approximation of the spectrum calculated directly at the coarser\
+        resolution, as the blocks are averaged before aggregation.
+
+    Args:
+        p: Amplitude spectrum, or spectra along the last axis, at the fine\
+            resolution.
+        factor: Ratio of the coarse to the fine frequency resolution.
+
+    Returns:
+        Amplitude spectrum with `len(p) // factor` bins.
+    """
+    p = np.asarray(p)
+    if factor == 1:
+        return p
+    n = p.shape[-1] // factor
+    pad = [(0, 0)] * (p.ndim - 1)
+    pad.append((factor // 2, max(n * factor - p.shape[-1] - factor // 2, 0)))
+    sq = np.pad(np.square(p), pad)[..., :n * factor]
+    sq = sq.reshape(p.shape[:-1] + (n, factor))
+    return np.sqrt(sq.sum(axis=-1))
+
+
+def _ae_signal(data: np.ndarray, prop: dict, gain: float) -> AESignal:
+    """
+    Wrap raw TDMS samples in an AESignal with the file and pre-amp scaling.
+
+    Args:
+        data: Raw samples read from the TDMS file.
+        prop: TDMS file properties, containing 'Gain' and 'Offset'.
+        gain: Gain setting of the pre-amp. (dB)
+
+    Returns:
+        AE signal in volts normalised to a 40 dB pre-amp.
+    """
+    factor = pre_amp_factor(gain)
+    if data.dtype == float:
+        return AESignal(data, factor, 0.0)
+    return AESignal(data,
+                    prop.get('Gain') * factor,
+                    prop.get('Offset') * factor,
+                    )
+
+
 class AE:
     def __init__(
             self,
@@ -169,9 +845,19 @@ class AE:
         self._testinfo = testinfo
         self.fft = {}
         self.trig_points = pd.DataFrame()
+        self._results = {}
+
+    def __setstate__(self, state: dict) -> None:
+        # older pickles store each fft as a list of dB arrays
+        fs = state.get('_fs')
+        state['fft'] = {
+            freqres: p if isinstance(p, Spectrum) else Spectrum(freqres, fs, p)
+            for freqres, p in state.get('fft', {}).items()
+        }
+        self.__dict__.update(state)
 
     @staticmethod
-    def volt2db(v: np.ndarray) -> list:
+    def volt2db(v: np.ndarray) -> np.ndarray:
         """Converts array from volts to dB.
 
         Calculates the equivalent amplitude dB for a given input array,\
@@ -184,7 +870,7 @@ class AE:
             The equivalent array converted to decibels.
         """
         v_ref = 1E-4
-        db = [20 * (np.log10(vin / v_ref)) for vin in v]
+        db = 20 * np.log10(np.divide(v, v_ref))
         return db
 
     def _fftcalc(self, fno: int, freqres: float) -> np.ndarray:
@@ -202,59 +888,210 @@ class AE:
 
         """
         length = int(self._fs / freqres)
-        data = self.readAE(fno)
-        trig = self.trig_points.loc[fno]
-        data = data[int(trig['trig st']):int(trig['trig end'])]
+        sig = self.read_signal(fno, *self._fft_window(fno))
         # data = envelope_hilbert(data)
-        if len(data) % length == 0:
-            temp = np.reshape(data, (length, -1), order='F')
-        else:
-            leftover = int(length - np.fmod(len(data), length))
-            temp = np.pad(data, (0, leftover), 'constant', constant_values=0)
-            temp = np.reshape(temp, (length, -1), order='F')
-
-        win = np.hanning(length)
-        win = np.expand_dims(win, axis=-1)
-        temp = np.multiply(win, temp)
-        sc = len(win) / sum(win)
-
-        fft = np.fft.fft(temp, n=length, axis=0)
-        p2 = abs(fft / length)
-        p = p2[0:int(np.floor(length / 2)), :]
-        p[1:] = p[1:] * 2
-        p = np.array(p * sc)
-        fft_mean = np.mean(p, axis=1)
+        fft_mean = sig.fft_mean(length)
         # print(f'Calc FFT - File {fno}... ')
         return fft_mean
 
-    def readAE(self, fno: int) -> list:
+    def _fft_window(self, fno: int) -> Tuple[int, Union[int, None]]:
+        """Start and end of the fft window for a file, (trigger points)."""
+        if self.trig_points.empty:
+            return 0, None
+        trig = self.trig_points.loc[fno]
+        return int(trig['trig st']), int(trig['trig end'])
+
+    def _spectrum_cache(self) -> Any:
+        """Spectrum cache for the experiment, next to the AE TDMS folder."""
+        filepath = CODE_DIR.joinpath(self._files[0])
+        return spectrum_cache(filepath.parent.parent.joinpath('Spectra'))
+
+    def _cached_spectrum(
+            self,
+            fno: int,
+            freqres: float,
+            derive: bool = False,
+    ) -> Union[np.ndarray, None]:
+        """
+        Get the mean amplitude spectrum of a file from the spectrum cache.
+
+        With `derive`, if the resolution hasn't been calculated, but a finer\
+            resolution that divides into it has, it is derived from the finer\
+            one with `aggregate_spectrum` and saved to the cache as derived.\
+            Derived spectra are only an approximation of the exact ones and\
+            are never returned without `derive`.
+
+        Args:
+            fno: File number to get the spectrum of.
+            freqres: Resolution of the fft.
+            derive: Option to derive the spectrum from a finer resolution.
+
+        Returns:
+            Mean amplitude spectrum, or None if it isn't in the cache.
+        """
+        cache = self._spectrum_cache()
+        filepath = CODE_DIR.joinpath(self._files[fno])
+        window = self._fft_window(fno)
+        spectra = cache.load(filepath, window)
+        if freqres in spectra:
+            return spectra[freqres]
+        if not derive:
+            return None
+        derived = cache.load(filepath, window, derived=True)
+        if freqres in derived:
+            return derived[freqres]
+
+        factors = {round(freqres / r): r for r in spectra
+                   if r < freqres and np.isclose(freqres % r, 0)}
+        if not factors:
+            return None
+        factor = min(factors)
+        p = aggregate_spectrum(spectra[factors[factor]], factor)
+        cache.save(filepath, window, freqres, p, derived=True)
+        return p
+
+    def _spectrum(self, fno: int, freqres: float) -> np.ndarray:
+        """
+        Mean amplitude spectrum of a file, calculating it if not cached.
+
+        Args:
+            fno: File number to get the spectrum of.
+            freqres: Resolution of the fft.
+
+        Returns:
+            Mean amplitude spectrum with `fs / (2 * freqres)` bins.
+        """
+        p = self._cached_spectrum(fno, freqres)
+        if p is None:
+            p = self._fftcalc(fno, freqres)
+            self._spectrum_cache().save(CODE_DIR.joinpath(self._files[fno]),
+                                        self._fft_window(fno),
+                                        freqres,
+                                        p,
+                                        )
+        return p
+
+    def _envelope(
+            self,
+            fno: int,
+    ) -> Tuple[Any, int, Tuple[int, np.ndarray, np.ndarray]]:
+        """
+        Signal of a file and its min/max envelope, for level of detail\
+            plotting.
+
+        The envelope is calculated the first time a file is plotted and,\
+            with a local cache configured, saved to the envelope cache. Once\
+            cached the file isn't read, instead a loader of windows of the\
+            signal is returned for when the plot is zoomed in.
+
+        Args:
+            fno: File number to get the envelope of.
+
+        Returns:
+            Tuple of the signal, or a loader `f(start, stop)` of windows of\
+                it, its number of samples and the envelope, (block size and\
+                the min and max of each block).
+        """
+        cache = envelope_cache()
+        filepath = CODE_DIR.joinpath(self._files[fno])
+        entry = None if cache is None else cache.load(filepath)
+        if entry is not None:
+            n, *envelope = entry
+            return partial(self.read_signal, fno), n, tuple(envelope)
+        sig = self.read_signal(fno)
+        envelope = (ENVELOPE_BLOCK, *minmax_blocks(sig, ENVELOPE_BLOCK))
+        if cache is not None:
+            cache.save(filepath, len(sig), *envelope)
+        return sig, len(sig), envelope
+
+    def spectra(self, freqres: float = 1000, derive: bool = False) -> Spectrum:
+        """
+        Mean fft of every AE signal in the experiment in dB.
+
+        Spectra are taken from `self.fft` or the on-disk spectrum cache,\
+            with only the files missing from the cache calculated. To get\
+            several resolutions cheaply ask for the finest first and set\
+            `derive`, the coarser ones are then derived from it without\
+            reading the signals. Derived spectra approximate the exact ones,\
+            (a few dB per bin, narrow peaks read high), so they are not\
+            stored in `self.fft`.
+
+        Args:
+            freqres: Resolution of the ffts.
+            derive: Option to derive the spectra from a finer cached\
+                resolution, see `aggregate_spectrum`.
+
+        Returns:
+            Spectrum matrix of the files in dB, also stored in `self.fft`\
+                unless derived.
+        """
+        if freqres in self.fft:
+            return self.fft[freqres]
+
+        fnos = range(len(self._files))
+        p = [self._cached_spectrum(fno, freqres, derive) for fno in fnos]
+        missing = [fno for fno in fnos if p[fno] is None]
+        if missing:
+            with multiprocessing.Pool() as pool:
+                fft = tqdm(pool.imap(partial(self._spectrum, freqres=freqres),
+                                     missing),
+                           total=len(missing),
+                           desc=f'Calc FFT  {freqres / 1000} kHz')
+                for fno, s in zip(missing, fft):
+                    p[fno] = s
+        spectrum = Spectrum(freqres, self._fs, self.volt2db(p))
+        if not derive:
+            self.fft[freqres] = spectrum
+        return spectrum
+
+    def read_signal(
+            self,
+            fno: int,
+            start: Union[int, None] = None,
+            stop: Union[int, None] = None,
+            step: int = 1,
+    ) -> AESignal:
+        """
+        Read AE data from TDMS file, keeping the raw samples and their scaling.
+
+        Args:
+            fno: TDMS file number to read into memory.
+            start: Index of the first sample to read, (slice semantics).
+            stop: Index after the last sample to read, (slice semantics).
+            step: Decimation stride between returned samples.
+
+        Returns:
+            AE signal with the gain, offset and pre-amp factor deferred.
+        """
+        filepath = CODE_DIR.joinpath(self._files[fno])
+        data, prop = read_ae_window(filepath, start, stop, step, self._fs)
+        return _ae_signal(data, prop, self._pre_amp.gain)
+
+    def readAE(
+            self,
+            fno: int,
+            start: Union[int, None] = None,
+            stop: Union[int, None] = None,
+            step: int = 1,
+    ) -> np.ndarray:
         """
         Read AE data from TDMS file and scale.
 
+        Only the requested window is read from disk, so callers that need a\
+            slice of the signal should pass it here rather than slicing the\
+            returned array.
+
         Args:
             fno: TDMS file number to read into memory.
+            start: Index of the first sample to read, (slice semantics).
+            stop: Index after the last sample to read, (slice semantics).
+            step: Decimation stride between returned samples.
 
         Returns:
             data: AE data from the TDMS file.
 
         """
-        filepath = CODE_DIR.joinpath(self._files[fno])
-        test = TdmsFile.read(filepath)
-        prop = test.properties
-        data = []
-        for group in test.groups():
-            for channel in group.channels():
-                data = channel[:]
-        if not data.dtype == float:
-            data = (data.astype(np.float64) * prop.get('Gain')) + prop.get(
-                'Offset'
-            )
-        if not self._pre_amp.gain == 40:
-            if self._pre_amp.gain == 20:
-                data = data * 10
-            elif self._pre_amp.gain == 60:
-                data = data / 10
-        return data
+        return self.read_signal(fno, start, stop, step).to_volts()
 
     def plotAE(self, fno: int, ax: plt.axes = None) -> Any:
         """
@@ -268,15 +1105,18 @@ class AE:
         else:
             fig = ax.get_figure()
 
-        signal = self.readAE(fno)
-        ts = 1 / self._fs
-        n = len(signal)
-        t = np.arange(0, n) * ts
+        # only a min/max per pixel column is drawn, refined on zoom
+        signal, n, envelope = self._envelope(fno)
         filename = self._files[fno].partition('_202')[0]
         filename = filename[-8:]
-        ax.plot(t, signal, linewidth=1)
+        LODLine(ax,
+                signal,
+                self._fs,
+                envelope=envelope,
+                n=n,
+                linewidth=1,
+                )
         ax.set_title(filename)
-        ax.autoscale(enable=True, axis='x', tight=True)
         ax.set_xlabel('Time (s)')
         ax.set_ylabel('Voltage (V)')
         mplcursors.cursor(multiple=True)
@@ -295,7 +1135,7 @@ class AE:
         if freqres in self.fft:
             p = self.fft[freqres][fno]
         else:
-            p = self._fftcalc(fno, freqres)
+            p = self.volt2db(self._spectrum(fno, freqres))
         f = np.arange(0, self._fs / 2, freqres, dtype=int)
 
         filename = self._files[fno].partition('_202')[0]
@@ -313,124 +1153,376 @@ class AE:
         fig.show()
         return fig, ax
 
-    def process(self, trigger: bool = True, FFT: bool = False) -> None:
+    def process(
+            self,
+            trigger: bool = True,
+            FFT: bool = False,
+            fast_trig: bool = False,
+            group: int = 1,
+            incremental: bool = True,
+    ) -> None:
         """
         Process the AE data calculating the crucial features.
 
         Multiprocessing function to process AE data saving the common features\
                 within the AE object, with the options
         to calculate between the trigger points and calculate the 1kHz fft.
+        Each file is read once, with the triggers, time features and fft all\
+                calculated from the same signal within one worker task.
 
         Args:
             trigger: Option to calculate features within the trigger points.
-            FFT: Option to calculate the 1kHz fft for each signal.
-
-        """
-        with multiprocessing.Pool(processes=20) as pool:
-            if self.trig_points.empty and trigger:
-                trigs = list(tqdm(pool.imap(self._triggers,
-                                            range(len(self._files))
-                                            ),
-                                  total=len(self._files),
-                                  desc='Triggers'))
-                self.trig_points = pd.DataFrame(trigs,
-                                                columns=['trig st',
-                                                         'trig end',
-                                                         'trig y-val'
-                                                         ],
-                                                )
-            # print('Calculating results...')
-            results = list(tqdm(pool.imap(self._calc, range(len(self._files))),
-                                total=len(self._files),
-                                desc='AE features'))
+            FFT: Option to recalculate the 1kHz fft for each signal, this\
+                reprocesses every file, as with `incremental=False`.
+            fast_trig: Option to find the triggers on a decimated envelope,\
+                see `_find_triggers`.
+            group: Number of files processed together by each worker task,\
+                with their start triggers found in one batched call.
+            incremental: Option to only process files which are new or have\
+                changed since they were last processed, keeping the stored\
+                results of the others. Triggers are found for new files if\
+                `trigger` is set or the experiment already has triggers, and\
+                the 1kHz fft is always extended to the new files. Files\
+                processed without triggers are processed again when\
+                `trigger` is set.
 
-            results = np.array(results)
-        pool.close()
+        """
+        fnos = list(range(len(self._files)))
+        prev = getattr(self, '_results', {})
+        incremental = incremental and not FFT
+        if incremental:
+            results = self._processed()
+            find_trig = trigger or not self.trig_points.empty
+            freqres = 1000
+        else:
+            results = {}
+            find_trig = self.trig_points.empty and trigger
+            freqres = 1000 if (1000 not in self.fft or FFT) else None
+        stats = [self._file_stat(fno) for fno in fnos]
+        todo = []
+        for fno in fnos:
+            old = results.get(self._files[fno], {})
+            if (old.get('stat') != stats[fno]
+                    or (find_trig and old.get('trig') is None)):
+                todo.append(fno)
+
+        records = []
+        if todo:
+            groups = [todo[i:i + group] for i in range(0, len(todo), group)]
+            with multiprocessing.Pool(processes=min(20, len(groups))) as pool:
+                with tqdm(total=len(todo), desc='AE processing') as pbar:
+                    for rec in pool.imap(partial(self._process_group,
+                                                 find_trig=find_trig,
+                                                 freqres=freqres,
+                                                 fast_trig=fast_trig,
+                                                 ),
+                                         groups
+                                         ):
+                        records.extend(rec)
+                        pbar.update(len(rec))
+            pool.close()
+
+        has_trig = find_trig or not self.trig_points.empty
+        for fno, rec in zip(todo, records):
+            trig_dec = rec['trig_dec']
+            if trig_dec is None:
+                # stored triggers, keep the envelope they were found on
+                trig_dec = prev.get(self._files[fno], {}).get('trig_dec', 1)
+            results[self._files[fno]] = {
+                'stat': stats[fno],
+                'trig': tuple(rec['trig']) if has_trig else None,
+                'trig_dec': trig_dec,
+                'features': tuple(rec['features']),
+            }
+        self._results = {f: results[f] for f in self._files}
+        done = list(self._results.values())
+
+        if all(r['trig'] is not None for r in done):
+            self.trig_points = pd.DataFrame([r['trig'] for r in done],
+                                            columns=['trig st',
+                                                     'trig end',
+                                                     'trig y-val'
+                                                     ],
+                                            )
+        features = np.array([r['features'] for r in done]).reshape(-1, 4)
+        self.kurt = features[:, 0]
+        self.rms = features[:, 1]
+        self.amplitude = features[:, 2]
+        self.skewness = features[:, 3]
+
+        if freqres is None:
+            return
+        if todo:
+            # other resolutions are rebuilt from the spectrum cache when asked
+            for r in [r for r in self.fft if r != freqres]:
+                del self.fft[r]
+        p = self.volt2db(np.array([r['fft'] for r in records]))
+        n_keep = len(fnos) - len(todo)
+        old = self.fft.get(freqres)
+        if len(todo) == len(fnos):
+            self.fft[freqres] = Spectrum(freqres, self._fs, p)
+        elif (old is not None and not FFT and len(old) == n_keep
+              and todo == fnos[n_keep:]):
+            if todo:
+                old.append(p)
+        else:
+            self.fft.pop(freqres, None)
+            self.spectra(freqres)
 
-        self.kurt = results[:, 0]
-        self.rms = results[:, 1]
-        self.amplitude = results[:, 2]
-        self.skewness = results[:, 3]
+    def _file_stat(self, fno: int) -> Tuple[int, int]:
+        """Size and modification time of an AE file, to detect changes."""
+        st = os.stat(CODE_DIR.joinpath(self._files[fno]))
+        return st.st_size, st.st_mtime_ns
 
-        if 1000 not in self.fft or FFT:
-            with multiprocessing.Pool(processes=20) as pool:
-                # print('Calculating FFT with 1kHz bins...')
-                fft = list(tqdm(pool.imap(partial(self._fftcalc, freqres=1000),
-                                          range(len(self._files))
-                                          ),
-                                total=len(self._files),
-                                desc='Calc FFT 1 kHz'))
-                p = self.volt2db(np.array(fft))
-                self.fft[1000] = p
-        pool.close()
+    def _processed(self) -> dict:
+        """
+        Per file results from previous calls of `process`, keyed by the file\
+            path.
 
-    def _calc(self, fno: int) -> List[np.ndarray]:
+        Objects pickled before the results were kept per file have them\
+            rebuilt from the stored features, assuming these belong to the\
+            first files in `self._files` as they are unchanged.
+
+        Returns:
+            Dict of the size/mtime, triggers and time features of each file.
+        """
+        results = getattr(self, '_results', None)
+        if results is not None:
+            return results
+
+        results = {}
+        n = min(len(self.kurt), len(self._files))
+        if self.trig_points.empty or len(self.trig_points) == len(self.kurt):
+            for fno in range(n):
+                try:
+                    stat = self._file_stat(fno)
+                except FileNotFoundError:
+                    continue
+                trig = None
+                if not self.trig_points.empty:
+                    trig = tuple(self.trig_points.loc[fno])
+                results[self._files[fno]] = {
+                    'stat': stat,
+                    'trig': trig,
+                    'features': (self.kurt[fno],
+                                 self.rms[fno],
+                                 self.amplitude[fno],
+                                 self.skewness[fno],
+                                 ),
+                }
+        self._results = results
+        return results
+
+    def _process_group(
+            self,
+            fnos: List[int],
+            find_trig: bool = True,
+            freqres: Union[float, None] = 1000,
+            fast_trig: bool = False,
+    ) -> List[dict]:
         """
-        Function for multiprocessing to calculate all the time driven AE\
-            results of an AE signal.
+        Function for multiprocessing to calculate the AE results of a group\
+            of files, reading each signal once.
 
         Args:
-            fno: File number to calculate features for.
+            fnos: File numbers to process.
+            find_trig: Option to find the triggers, otherwise the stored\
+                trigger points are used (whole signal if there are none).
+            freqres: Resolution of the fft to calculate, None to skip the fft.
+            fast_trig: Option to find the triggers on a decimated envelope.
+
+        Returns:
+            Result record for each file, with the triggers (trig st, trig\
+            end, trig y-val), the decimation of the envelope they were found\
+            on (None if not found), time features (k, r, a, sk) and fft (or\
+            None).
+        """
+        sigs = [self.read_signal(fno) for fno in fnos]
+        has_trig = find_trig or not self.trig_points.empty
+        trig_dec = None
+        if find_trig:
+            trigs = self._find_triggers_batch(sigs, fast=fast_trig)
+            trig_dec = FAST_TRIG_DEC if fast_trig else 1
+        elif has_trig:
+            trigs = [tuple(self.trig_points.loc[fno]) for fno in fnos]
+        else:
+            trigs = [(0, len(sig), 0) for sig in sigs]
+
+        records = []
+        for fno, sig, trig in zip(fnos, sigs, trigs):
+            sig = sig[int(trig[0]):int(trig[1])]
+            record = {'trig': trig,
+                      'trig_dec': trig_dec,
+                      'features': self._time_features(sig),
+                      'fft': None,
+                      }
+            if freqres is not None:
+                record['fft'] = sig.fft_mean(int(self._fs / freqres))
+                window = (0, None)
+                if has_trig:
+                    window = (int(trig[0]), int(trig[1]))
+                self._spectrum_cache().save(
+                    CODE_DIR.joinpath(self._files[fno]),
+                    window,
+                    freqres,
+                    record['fft'],
+                )
+            records.append(record)
+        return records
+
+    @staticmethod
+    def _time_features(sig: AESignal) -> Tuple[float, float, float, float]:
+        """
+        Calculate the time driven AE features of a signal.
+
+        Args:
+            sig: AE signal to calculate features for.
 
         Returns:
             A tuple containg the kurtosis, rms, amplitude and skewness of the\
             signal (k, r, a, sk)
         """
-        data = self.readAE(fno)
-        trig = self.trig_points.loc[fno]
-        data = data[int(trig['trig st']):int(trig['trig end'])]
-        r = rms(data)
-        k = kurtosis(data, fisher=False)
-        a = data.max()
-        sk = skew(data)
-        # print(f'Completed File {fno}...')
-        return k, r, a, sk
+        m = sig.moments()
+        return m.kurtosis, m.rms, m.max, m.skew
 
-    def _triggers(self, fno: int) -> List[Union[int, float]]:
+    def _find_triggers(
+            self,
+            sig: AESignal,
+            fast: bool = False,
+            decimate: int = FAST_TRIG_DEC,
+    ) -> List[Union[int, float]]:
         """
-        Compute the start and end trigger indicies, as well as the y-value at\
-            those points.
+        Compute the start and end trigger indicies of an AE signal in memory.
+
+        The fast mode replaces the full rate hilbert envelope and filter with\
+            a block envelope decimated by `decimate` (see `envelope_blocks`),\
+            and maps the trigger indices back to full rate samples. The fast\
+            triggers are close to, not equal to, the full rate ones. With\
+            the default decimation the start trigger is within 2000\
+            samples, the end trigger within 500 samples and the y value\
+            reads about 7% high, (within 10%), as the block envelope sits\
+            above the hilbert envelope, see tests/test_triggers.py.
 
         Args:
-            fno: File number to find the triggers of.
+            sig: AE signal to find the triggers of.
+            fast: Option to find the triggers on a decimated envelope.
+            decimate: Decimation factor for the fast mode, should divide\
+                100_000 so the gradient chunks line up with the full rate.
 
         Returns:
             A tuple containing the start index, end index, and y value\
             (trig_st, trig_end, trig_y_val).
+        """
+        return self._find_triggers_batch([sig], fast, decimate)[0]
 
+    def _find_triggers_batch(
+            self,
+            sigs: List[AESignal],
+            fast: bool = False,
+            decimate: int = FAST_TRIG_DEC,
+    ) -> List[Tuple[int, int, float]]:
         """
-        sig = self.readAE(fno)
-        e_sig = envelope_hilbert(sig[:6_000_000])
-        f_sig = butter_filter(data=e_sig, fs=self._fs, order=3, ftype='low')
-        trig, trig_y_val = trigger_st(f_sig[100_000:])
-        if trig is None:
-            trig_st = 0
-            trig_end = len(sig)
-            trig_y_val = 0
-        else:
-            trig_st = trig + 100_000
-            en_trig2 = envelope_hilbert(sig[-6_000_000:])
-            fil_trig2 = butter_filter(data=en_trig2,
-                                      fs=self._fs,
-                                      order=3,
-                                      ftype='low'
+        Compute the trigger points of a group of AE signals in memory.
+
+        The start triggers of the group are found in one call to\
+            `trigger_st_batch` on the stacked filtered envelopes, the end\
+            triggers are then found per signal.
+
+        Args:
+            sigs: AE signals to find the triggers of.
+            fast: Option to find the triggers on a decimated envelope.
+            decimate: Decimation factor for the fast mode.
+
+        Returns:
+            List of tuples containing the start index, end index, and y value\
+            (trig_st, trig_end, trig_y_val) for each signal.
+        """
+        dec = decimate if fast else 1
+        heads = [self._filt_env(sig[:6_000_000], dec)[100_000 // dec:]
+                 for sig in sigs]
+        if len({len(h) for h in heads}) == 1:
+            t, t_y = trigger_st_batch(np.stack(heads),
+                                      chunk_size=100_000 // dec,
+                                      diff_change=1.75E-6 * dec,
                                       )
-            trig_end = (
-                5_900_000 - np.argmax(fil_trig2[100_000:] < trig_y_val)
+        else:
+            res = [trigger_st_batch(h,
+                                    chunk_size=100_000 // dec,
+                                    diff_change=1.75E-6 * dec,
+                                    )
+                   for h in heads]
+            t = np.concatenate([r[0] for r in res])
+            t_y = np.concatenate([r[1] for r in res])
+
+        trigs = []
+        for sig, f_sig, trig, trig_y_val in zip(sigs, heads, t, t_y):
+            n = len(sig)
+            if np.isnan(trig):
+                trigs.append((0, n, 0))
+                continue
+            if fast:
+                trig_y_val = np.interp(trig - 0.5,
+                                       np.arange(len(f_sig)),
+                                       f_sig,
+                                       )
+            trig_st = trig * dec + 100_000
+            fil_trig2 = self._filt_env(sig[-6_000_000:], dec)
+            trig_end = 5_900_000 - self._first_below(
+                fil_trig2[100_000 // dec:], trig_y_val, dec
             )
             if trig_end == 5_900_000:
-                en_trig2 = envelope_hilbert(sig[6_000_000:-6_000_000])
-                fil_trig2 = butter_filter(data=en_trig2,
-                                          fs=self._fs,
-                                          order=3,
-                                          ftype='low'
-                                          )
-                trig_end = 6_100_000 + (np.argmax(
-                    fil_trig2[100_000:] < trig_y_val
-                ))
+                fil_trig2 = self._filt_env(sig[6_000_000:-6_000_000], dec)
+                trig_end = 6_100_000 + self._first_below(
+                    fil_trig2[100_000 // dec:], trig_y_val, dec
+                )
             else:
-                trig_end = len(sig) - trig_end
-        return trig_st, trig_end, trig_y_val
+                trig_end = n - trig_end
+            trigs.append((trig_st, trig_end, trig_y_val))
+        return trigs
+
+    def _filt_env(self, sig: AESignal, dec: int = 1) -> np.ndarray:
+        """
+        Envelope and low pass filter an AE signal for trigger finding.
+
+        Args:
+            sig: AE signal to envelope.
+            dec: Decimation factor, 1 uses the full rate hilbert envelope.
+
+        Returns:
+            Filtered envelope of the signal, decimated by `dec`.
+        """
+        if dec > 1:
+            e = envelope_blocks(sig, dec)
+        else:
+            e = envelope_hilbert(sig.to_volts())
+        return butter_filter(data=e,
+                             fs=self._fs / dec,
+                             order=3,
+                             ftype='low',
+                             pad=10_000 // dec,
+                             )
+
+    @staticmethod
+    def _first_below(f: np.ndarray, y: float, dec: int = 1) -> int:
+        """
+        Full rate index of the first sample of a filtered envelope below y.
+
+        Decimated samples sit at block centres, so the crossing is linearly\
+            interpolated between them. Returns 0 if no sample is below y.
+
+        Args:
+            f: Filtered envelope, decimated by `dec`.
+            y: Threshold value.
+            dec: Decimation factor of the envelope.
+
+        Returns:
+            Index of the crossing in full rate samples.
+        """
+        k = np.argmax(f < y)
+        if dec == 1 or k == 0:
+            return k
+        frac = (f[k - 1] - y) / (f[k - 1] - f[k])
+        return int(round((k - 1 + frac) * dec + dec / 2))
 
     def fftsurf(
             self,
@@ -445,17 +1537,7 @@ class AE:
             freqlim: Limits of the freq axis for the surface.
 
         """
-        if freqres in self.fft:
-            p = self.fft[freqres]
-        else:
-            with multiprocessing.Pool() as pool:
-                fft = list(tqdm(
-                    pool.imap(partial(self._fftcalc, freqres=freqres),
-                              range(len(self._files))),
-                    total=len(self._files),
-                    desc=f'Calc FFT  {freqres / 1000} kHz'))
-                p = self.volt2db(np.array(fft))
-            self.fft[freqres] = p
+        p = self.spectra(freqres)
 
         if freqlim is None:
             freqlim = {'lowlim': int(0 / freqres),
@@ -467,7 +1549,7 @@ class AE:
                        }
         f = np.arange(0, self._fs / 2, freqres, dtype=int)
         n = np.arange(0, len(self._files))
-        p = np.array(p)
+        p = np.asarray(p)
         f = f[freqlim['lowlim']:freqlim['uplim']]
         p = p[:, freqlim['lowlim']:freqlim['uplim']]
 
@@ -481,15 +1563,19 @@ class AE:
         ax.set_title(f'Test No: {self._testinfo.testno} - FFT')
         fig.show()
     
-    def fft_2d_surf(self, freqlim: Union[None, list] = None):
-        p = np.array(self.fft[1000])
+    def fft_2d_surf(
+            self,
+            freqlim: Union[None, list] = None,
+            freqres: float = 1000,
+    ):
+        p = np.asarray(self.spectra(freqres))
         if freqlim is None:
-            freqlim = {'lowlim': int(0 / 1000),
-                       'uplim': int(self._fs / (2 * 1000))
+            freqlim = {'lowlim': int(0 / freqres),
+                       'uplim': int(self._fs / (2 * freqres))
                        }
         else:
-            freqlim = {'lowlim': int(freqlim[0] / 1000),
-                       'uplim': int(freqlim[1] / 1000)
+            freqlim = {'lowlim': int(freqlim[0] / freqres),
+                       'uplim': int(freqlim[1] / freqres)
                        }
         p = p[:, freqlim['lowlim']:freqlim['uplim']]
 
@@ -504,7 +1590,8 @@ class AE:
         ax.set_xlabel('Frequency (kHz)')
         ax.set_ylabel('Measurement No')
         xticks = ax.get_xticks()
-        xticks_labels = [(xt + freqlim['lowlim']) for xt in xticks]
+        xticks_labels = [(xt + freqlim['lowlim']) * freqres / 1000
+                         for xt in xticks]
         # ax.set_xticks(xticks)
         ax.set_xticklabels(xticks_labels)
         return fig
@@ -526,7 +1613,7 @@ class AE:
         import moviepy.editor as mp
         from matplotlib.animation import PillowWriter
 
-        def calc_roll_rms(i: int, win_size: float = 500_000) -> np.ndarray:
+        def calc_roll_rms(i: int, win_size: int = 500_000) -> np.ndarray:
             """
             Calculate the rolling rms of the AE file
 
@@ -537,11 +1624,9 @@ class AE:
             Returns:
                 An array of the calculated rolling rms for the specified file.
             """
-            data = self.readAE(i)
-            data = pd.DataFrame(data)
-            v = data.pow(2).rolling(win_size).mean().apply(np.sqrt, raw=True)
-            v = v[1_000_000:41_000_000].to_numpy()
-            return v
+            # windows ending on samples 1M to 41M, only reading those samples
+            data = self.read_signal(i, 1_000_000 - win_size + 1, 41_000_000)
+            return data.rolling_rms(win_size)
 
         def mp4_conv(gifname: str) -> None:
             """
@@ -558,15 +1643,12 @@ class AE:
         ts = 1 / self._fs
         if type(fno) is int:
             v_rms = calc_roll_rms(fno)
-            n = v_rms.size
-            t = np.arange(0, n) * ts
             if plot_fig:
                 fig, ax = plt.subplots()
-                ax.plot(t, v_rms, linewidth=0.75)
+                LODLine(ax, v_rms, self._fs, linewidth=0.75)
                 ax.set_xlabel('Time (s)')
                 ax.set_ylabel('RMS (s)')
                 ax.set_title(f'File {fno} - Rolling RMS')
-                ax.autoscale(enable=True, axis='x', tight=True)
                 mplcursors.cursor(multiple=True)
                 fig.show()
             return v_rms
@@ -607,6 +1689,10 @@ class AE:
         Plot calculated trigger points of the file on the hibert enveloped\
             and lowpass filtered AE signal
 
+        The envelope is recomputed as the triggers were found, full rate or\
+            decimated for the fast mode, so the `trig y-val` line crosses it\
+            at `trig st`.
+
         Args:
             fno: File number to show triggers
 
@@ -623,17 +1709,22 @@ class AE:
         else:
             fig = ax.get_figure()
 
-        sig = self.readAE(fno)
+        sig = self.read_signal(fno)
         ts = 1 / self._fs
-        n = len(sig)
-        t = np.arange(0, n) * ts
         filename = f'Test {fno:03d} - Triggers of enveloped & filtered' \
                    f'AE signal'
 
-        en_sig = envelope_hilbert(sig)
-        sig = butter_filter(data=en_sig, fs=self._fs, order=3, ftype='low')
-
-        ax.plot(t, sig, linewidth=1)
+        # same envelope as the trigger search, decimated samples sit at the
+        # centres of their blocks
+        dec = getattr(self, '_results', {}).get(self._files[fno], {}).get(
+            'trig_dec', 1)
+        env = self._filt_env(sig, dec)
+        LODLine(ax,
+                env,
+                self._fs / dec,
+                t0=(dec - 1) / 2 * ts,
+                linewidth=1,
+                )
         ax.axhline(triggers['trig y-val'],
                    color='r', linewidth=1, alpha=0.8, linestyle='--')
         ax.axvline(triggers['trig st'] * ts,
@@ -641,35 +1732,227 @@ class AE:
         ax.axvline(triggers['trig end'] * ts,
                    color='r', linewidth=1, alpha=0.8, linestyle='--')
         ax.set_title(filename)
-        ax.autoscale(enable=True, axis='x', tight=True)
         ax.set_xlabel('Time (s)')
         ax.set_ylabel('Voltage (V)')
         return fig, ax
 
 
+# block sizes of the RMS pyramid, in samples
+RMS_LEVELS = (10_000, 100_000, 1_000_000)
+
+
+def _rms_folder(exp_name: str) -> Union[Path, None]:
+    """
+    Find the folder of an experiment from the reference file of test object\
+        locations.
+
+    Args:
+        exp_name: Name of the experiment, e.g. 'Test 5'.
+
+    Returns:
+        Folder of the experiment, or None if it isn't in the reference file.
+    """
+    ref_test_loc = CODE_DIR.joinpath(
+        'src/reference/Test obj locations.txt'
+    )
+    f_locs = pd.read_csv(ref_test_loc, sep=',', index_col=0)
+    f_locs = f_locs.to_dict()['Obj location']
+    f_locs = {k: BASE_DIR.joinpath(r'AE/Testing', v)
+              for k, v in f_locs.items()}
+    try:
+        return f_locs[exp_name.lower().replace(' ', '')].parent
+    except KeyError:
+        print('Test object not found in reference file')
+        return None
+
+
+def _rms_files(folder: Union[str, Path]) -> List[str]:
+    """
+    AE TDMS files of an experiment, one RMS column per file.
+
+    Files are kept in glob order, unsorted, so column numbers line up with\
+        RMS stores and csvs written before, the file names are also kept in\
+        the store metadata.
+    """
+    assert os.path.exists(os.path.join(folder, 'AE'))
+    return glob.glob(os.path.join(folder, 'AE/TDMS/*.tdms'))
+
+
+def _calc_rms_levels(
+        filepath: Union[str, Path],
+        pre_amp_gain: float,
+        rolling: bool = True,
+) -> Tuple[Union[np.ndarray, None], List[np.ndarray]]:
+    """
+    Rolling RMS of an AE file, over a 500k sample window and averaged into\
+        blocks of 100k, and its block RMS at each of RMS_LEVELS, from a\
+        single read of the file.
+
+    Args:
+        filepath: Path to the AE TDMS file.
+        pre_amp_gain: Gain setting of the pre-amp. (dB)
+        rolling: Option to calculate the rolling RMS, otherwise only the\
+            block RMS is calculated.
+
+    Returns:
+        Tuple of the block averaged rolling RMS, (None if not calculated),\
+            and the list of block RMS.
+    """
+    data, prop = read_ae_window(filepath)
+    sig = _ae_signal(data, prop, pre_amp_gain)
+    rms_ = sig.rolling_rms(500_000, block=100_000) if rolling else None
+    return rms_, sig.block_rms(RMS_LEVELS)
+
+
+def _rms_task(task: Tuple[str, str, float, bool]) -> Tuple[str, str, Any]:
+    # pool task for build_rms, tagged so results can arrive in any order
+    exp_name, filepath, pre_amp_gain, rolling = task
+    return exp_name, filepath, _calc_rms_levels(filepath,
+                                                pre_amp_gain,
+                                                rolling,
+                                                )
+
+
+def _save_rms(
+        folder: Union[str, Path],
+        results: List[Tuple[np.ndarray, List[np.ndarray]]],
+        fs: float,
+        files: List[str],
+) -> Union[RMSStore, None]:
+    """
+    Write the RMS and RMS levels of each AE file of an experiment to its\
+        stores, cropping every file to the shortest.
+
+    An existing RMS store is kept, as only the levels can be missing.
+
+    Args:
+        folder: Folder of the experiment.
+        results: RMS of each file in order, from `_calc_rms_levels`.
+        fs: Sample rate of the AE acquisition.
+        files: AE file of each result, stored by name in the metadata.
+
+    Returns:
+        RMS store of the experiment, or None if it doesn't exist and the\
+            rolling RMS wasn't calculated.
+    """
+    folder = os.fspath(folder)
+    names = [os.path.basename(f) for f in files]
+    for i, block in enumerate(RMS_LEVELS):
+        level = [r[1][i] for r in results]
+        m = min([r.shape[0] for r in level])
+        RMSStore.write(os.path.join(folder, 'AE_RMS_levels', f'{block}.npy'),
+                       np.array([r[:m] for r in level]),
+                       meta={'block': block, 'fs': fs, 'files': names},
+                       )
+
+    path = os.path.join(folder, 'AE_RMS.npy')
+    if RMSStore.exists(path):
+        return RMSStore(path)
+    if any(r[0] is None for r in results):
+        return None
+    rms = [r[0] for r in results]
+    m = min([r.shape[0] for r in rms])
+    store = RMSStore.write(path,
+                           np.array([r[:m] for r in rms]),
+                           meta={'files': names},
+                           )
+    print(f'AE RMS data saved to {path}')
+    return store
+
+
+def build_rms(
+        exp_names: List[str],
+        pre_amp_gain: int = 20,
+        fs: float = 2_000_000,
+        processes: Union[int, None] = None,
+) -> dict:
+    """
+    Build the RMS stores of several experiments on one shared pool.
+
+    Files of every experiment missing a store or its levels are queued\
+        round-robin across the experiments, so they all progress together,\
+        and each experiment's stores are written as soon as its last file is\
+        done.
+
+    Args:
+        exp_names: Names of the experiments, e.g. ['Test 5', 'Test 7'].
+        pre_amp_gain: Gain setting of the pre-amp. (dB)
+        fs: Sample rate of the AE acquisition.
+        processes: Number of worker processes, default the number of CPUs.
+
+    Returns:
+        Dict of the RMS object of each experiment.
+    """
+    files = {}
+    for name in exp_names:
+        folder = _rms_folder(name)
+        if folder is None:
+            continue
+        have_rms = (RMSStore.exists(folder.joinpath('AE_RMS.npy'))
+                    or os.path.exists(folder.joinpath('AE_RMS.csv')))
+        have_levels = all(RMSStore.exists(
+            folder.joinpath('AE_RMS_levels', f'{b}.npy')) for b in RMS_LEVELS)
+        if not (have_rms and have_levels):
+            files[name] = (folder, _rms_files(folder), not have_rms)
+
+    queues = [[(name, f, pre_amp_gain, rolling) for f in exp_files]
+              for name, (_, exp_files, rolling) in files.items()]
+    tasks = [t for t in chain(*zip_longest(*queues)) if t is not None]
+    if tasks:
+        results = {name: {} for name in files}
+        processes = min(processes or os.cpu_count() or 1, len(tasks))
+        with multiprocessing.Pool(processes) as pool:
+            for name, filepath, res in tqdm(
+                    pool.imap_unordered(_rms_task, tasks),
+                    total=len(tasks),
+                    desc='Calculating RMS',
+            ):
+                results[name][filepath] = res
+                folder, exp_files, _ = files[name]
+                if len(results[name]) == len(exp_files):
+                    _save_rms(folder,
+                              [results[name][f] for f in exp_files],
+                              fs,
+                              exp_files,
+                              )
+                    del results[name]
+                    tqdm.write(f'{name}: RMS of {len(exp_files)} files done')
+        pool.close()
+
+    return {name: RMS(name, pre_amp_gain, fs=fs) for name in exp_names}
+
+
 class RMS:
     def __init__(self,
                  exp_obj: str = None,
                  pre_amp_gain: int = 20,
+                 columns: Union[list, None] = None,
+                 rows: Union[slice, list, None] = None,
+                 fs: float = 2_000_000,
                  ) -> None:
-        
+        """
+        Rolling RMS of every AE file in an experiment.
+
+        Args:
+            exp_obj: Name of the experiment, e.g. 'Test 5', or None to pick\
+                the folder.
+            pre_amp_gain: Gain setting of the pre-amp. (dB)
+            columns: Labels of the files to load into `data`, default all.
+            rows: Slice or indices of the RMS samples to load into `data`,\
+                default all.
+            fs: Sample rate of the AE acquisition.
+        """
         self._data = None
         self._folder = None
         self._pre_amp_gain = pre_amp_gain
+        self._fs = fs
+        self._columns = columns
+        self._rows = rows
         self.exp_name = 'Test_99'
 
         if type(exp_obj) is str:
-            ref_test_loc = CODE_DIR.joinpath(
-                'src/reference/Test obj locations.txt'
-            )
-            f_locs = pd.read_csv(ref_test_loc, sep=',', index_col=0)
-            f_locs = f_locs.to_dict()['Obj location']
-            f_locs = {k: BASE_DIR.joinpath(r'AE/Testing', v)
-                      for k, v in f_locs.items()}
-            try:
-                self._folder = f_locs[exp_obj.lower().replace(' ', '')].parent
-            except KeyError:
-                print('Test object not found in reference file')
+            self._folder = _rms_folder(exp_obj)
+            if self._folder is None:
                 exp_obj = None
 
         if exp_obj is None:
@@ -685,7 +1968,8 @@ class RMS:
             if re.search(r'Test \d.pickle', f):
                 self.exp_name = f.split('.pickle')[0]
 
-        self.no_files = self.data.shape[1]
+        # every file of the experiment, not only the selected columns
+        self.no_files = len(self.store.columns)
 
         print('-' * 50)
         print(f'Loaded RMS data for "{self._folder.parts[-1]}"')
@@ -700,83 +1984,189 @@ class RMS:
         else:
             self._data = self._get_data()
             return self._data
-        
+
+    @property
+    def store(self) -> RMSStore:
+        """
+        Binary store of the RMS data, processed from the AE files or\
+            converted from an old AE_RMS.csv if it doesn't exist yet.
+        """
+        path = self._folder.joinpath('AE_RMS.npy')
+        if RMSStore.exists(path):
+            return RMSStore(path)
+        csv = self._folder.joinpath('AE_RMS.csv')
+        if os.path.exists(csv):
+            return RMSStore.write(path, pd.read_csv(csv))
+        print(f'Processing RMS data for {self._folder.parts[-1]}')
+        return self._process_rms()
+
     def _get_data(self) -> pd.DataFrame:
-        try:
-            file = self._folder.joinpath('AE_RMS.csv')
-            return pd.read_csv(file)
-        except FileNotFoundError:
-            print(f'Processing RMS data for {self._folder.parts[-1]}')
-            return self._process_rms()
-
-    def _process_rms(self) -> pd.DataFrame:
-        assert os.path.exists(self._folder.joinpath('AE'))
-        self._aefiles = glob.glob(os.path.join(self._folder, 'AE/TDMS/*.tdms'))
+        return self.store.select(self._columns, self._rows)
+
+    def _level_path(self, block: int) -> Path:
+        return self._folder.joinpath('AE_RMS_levels', f'{block}.npy')
+
+    def levels(self) -> List[int]:
+        """Block sizes of the RMS levels that have been stored."""
+        return [b for b in RMS_LEVELS
+                if RMSStore.exists(self._level_path(b))]
+
+    def level(
+            self,
+            block: int = 100_000,
+            columns: Union[list, None] = None,
+            t: Union[Tuple[float, float], None] = None,
+    ) -> pd.DataFrame:
+        """
+        Block RMS of the AE files at one level of the RMS pyramid.
+
+        Levels are calculated for every block size in RMS_LEVELS with one\
+            pass over the AE files, the first time any level is asked for.\
+            Other multiples of the smallest block are aggregated from it.
+
+        Args:
+            block: Number of AE samples in each RMS block.
+            columns: Labels of the files to load, default all.
+            t: Start and end time to load, (s), default all.
+
+        Returns:
+            DataFrame of the block RMS, (blocks x files), indexed by the\
+                start time of each block.
+        """
+        if not self.levels():
+            print(f'Processing RMS levels for {self._folder.parts[-1]}')
+            self._process_rms(rolling=False)
+        base = RMS_LEVELS[0]
+        if block % base:
+            raise ValueError(f'RMS block size must be a multiple of {base}.')
+        stored = block if block in RMS_LEVELS else base
+        factor = block // stored
+        store = RMSStore(self._level_path(stored))
+        fs = store.meta.get('fs', self._fs)
+
+        rows = None
+        if t is not None:
+            rows = slice(int(t[0] * fs / block) * factor,
+                         -(-int(t[1] * fs) // block) * factor)
+        data = store.select(columns, rows)
+        first = data.index[0] // factor if len(data) else 0
+        if factor > 1:
+            # mean square of whole groups of the smaller blocks
+            groups = np.arange(len(data)) // factor
+            data = np.sqrt(np.square(data).groupby(groups).mean())
+        data.index = (first + np.arange(len(data))) * block / fs
+        data.index.name = 'Time (s)'
+        return data
+
+    def to_csv(self, path: Union[str, Path, None] = None) -> None:
+        """
+        Export all of the RMS data to a csv, default AE_RMS.csv in the\
+            experiment folder.
+
+        Args:
+            path: Location of the csv file.
+        """
+        if path is None:
+            path = self._folder.joinpath('AE_RMS.csv')
+        self.store.to_csv(path)
+        print(f'AE RMS data saved to {path}')
+
+    def _process_rms(self, rolling: bool = True) -> Union[RMSStore, None]:
+        """
+        Calculate the RMS levels of every AE file and save the stores.
+
+        Args:
+            rolling: Option to also calculate the rolling RMS, for the main\
+                store, otherwise only the RMS levels are calculated.
+
+        Returns:
+            RMS store of the experiment, or None if it doesn't exist and\
+                `rolling` isn't set.
+        """
+        self._aefiles = _rms_files(self._folder)
         no_files = len(self._aefiles)
         fnos = range(no_files)
 
         with multiprocessing.Pool() as pool:
-            rms = list(tqdm(pool.imap(self._calc_rms, fnos),
-                            total=no_files,
-                            desc='Calculating RMS',
-                            ))
+            results = list(tqdm(pool.imap(partial(self._calc_rms_levels,
+                                                  rolling=rolling,
+                                                  ),
+                                          fnos,
+                                          ),
+                                total=no_files,
+                                desc='Calculating RMS',
+                                ))
         pool.close()
-        m = min([r.shape[0] for r in rms])
-        rms = [r[:m] for r in rms]
-        rms = np.array(rms)
-
-        data = pd.DataFrame(rms.T)
-        data.to_csv(self._folder.joinpath('AE_RMS.csv'),
-                    index=False,
-                    encoding='utf-8',
-                    )
-        print(f'AE RMS data saved to {self._folder.joinpath("AE_RMS.csv")}')
-        return data
+        return _save_rms(self._folder, results, self._fs, self._aefiles)
 
-    def _readAE(self, fno: int) -> np.ndarray:
+    def _readAE(
+            self,
+            fno: int,
+            start: Union[int, None] = None,
+            stop: Union[int, None] = None,
+            step: int = 1,
+    ) -> np.ndarray:
         """
         Read the AE data from the specified file
 
         Args:
             fno: File number to read
+            start: Index of the first sample to read, (slice semantics).
+            stop: Index after the last sample to read, (slice semantics).
+            step: Decimation stride between returned samples.
 
         Returns:
             AE data as a numpy array
 
         """
+        return self._read_signal(fno, start, stop, step).to_volts()
+
+    def _read_signal(
+            self,
+            fno: int,
+            start: Union[int, None] = None,
+            stop: Union[int, None] = None,
+            step: int = 1,
+    ) -> AESignal:
+        """
+        Read the raw AE samples of the specified file, without scaling.
+
+        Args:
+            fno: File number to read
+            start: Index of the first sample to read, (slice semantics).
+            stop: Index after the last sample to read, (slice semantics).
+            step: Decimation stride between returned samples.
+
+        Returns:
+            AE signal with deferred scaling to volts.
+        """
         file = self._aefiles[fno]
-        test = TdmsFile(file)
-        prop = test.properties
-        data = []
-        for group in test.groups():
-            for channel in group.channels():
-                data = channel[:]
-        if not data.dtype == float:
-            data = (data.astype(np.float64) * prop.get('Gain')) + prop.get(
-                'Offset'
-            )
-        if not self._pre_amp_gain == 40:
-            if self._pre_amp_gain == 20:
-                data = data * 10
-            elif self._pre_amp_gain == 60:
-                data = data / 10
-        return data
+        data, prop = read_ae_window(file, start, stop, step)
+        return _ae_signal(data, prop, self._pre_amp_gain)
 
-    def _calc_rms(self, fno: int) -> np.ndarray:
-        sig = self._readAE(fno)
-        avg_size = 100000
-        sig = pd.DataFrame(sig)
-        sig = sig.pow(2).rolling(500000).mean().apply(np.sqrt, raw=True)
-        sig = np.array(sig)[500000 - 1:]
-        avg_sig = np.nanmean(np.pad(sig.astype(float),
-                                    ((0, avg_size - sig.size % avg_size),
-                                     (0, 0)
-                                     ),
-                                    mode='constant',
-                                    constant_values=np.NaN
-                                    )
-                             .reshape(-1, avg_size), axis=1)
-        return avg_sig
+    def _calc_rms_levels(
+            self,
+            fno: int,
+            rolling: bool = True,
+    ) -> Tuple[Union[np.ndarray, None], List[np.ndarray]]:
+        """
+        Rolling RMS of an AE file, over a 500k sample window and averaged\
+            into blocks of 100k, and its block RMS at each of RMS_LEVELS,\
+            from a single read of the file.
+
+        Args:
+            fno: File number to calculate for.
+            rolling: Option to calculate the rolling RMS, otherwise only the\
+                block RMS is calculated.
+
+        Returns:
+            Tuple of the block averaged rolling RMS, (None if not\
+                calculated), and the list of block RMS.
+        """
+        return _calc_rms_levels(self._aefiles[fno],
+                                self._pre_amp_gain,
+                                rolling,
+                                )
 
     def plot_rms(self,
                  fno: Union[int, list, tuple],
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+"""
+Local disk cache for AE samples.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable, Tuple, Union
+
+import numpy as np
+
+from .. import config
+
+
+def _source_stat(filepath: Union[str, Path]) -> dict:
+    """
+    Size and modification time of a source file, to validate cache entries.
+    """
+    st = os.stat(filepath)
+    return {'size': st.st_size, 'mtime': st.st_mtime_ns}
+
+
+def _file_key(*parts: Any) -> str:
+    path = os.path.normcase(os.path.abspath(parts[0]))
+    key = '|'.join([path] + [str(p) for p in parts[1:]])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+class SampleCache:
+    def __init__(self, root: Union[str, Path], max_bytes: int) -> None:
+        """
+        Cache of raw AE samples as flat memory-mappable binary files.
+
+        Each source TDMS file is stored as `<key>.bin`, holding the raw\
+            samples with no header, and `<key>.json`, holding the dtype,\
+            length, scaling and the size/mtime of the source file. Entries\
+            are invalidated when the source changes, and the least recently\
+            used entries are evicted once the cache grows over `max_bytes`.\
+            Eviction runs before and after every write, as several workers\
+            can fill the cache at once, and when the cache is opened, so a\
+            cache left over the cap shrinks again.
+
+        Args:
+            root: Directory to store the cache in.
+            max_bytes: Size cap for the cached sample files.
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._evict()
+
+    def _paths(self, filepath: Union[str, Path]) -> Tuple[Path, Path]:
+        key = _file_key(filepath)
+        return self.root.joinpath(f'{key}.bin'), self.root.joinpath(
+            f'{key}.json'
+        )
+
+    def get(
+            self,
+            filepath: Union[str, Path],
+    ) -> Union[Tuple[np.memmap, dict], None]:
+        """
+        Map the cached samples for a source file, if they are up to date.
+
+        Args:
+            filepath: Path to the source TDMS file.
+
+        Returns:
+            Tuple of the memory-mapped raw samples and the sidecar metadata,\
+                or None if there is no valid entry.
+        """
+        bin_path, meta_path = self._paths(filepath)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if meta.get('source') != _source_stat(filepath):
+            self.remove(filepath)
+            return None
+        try:
+            data = np.memmap(bin_path,
+                             dtype=np.dtype(meta['dtype']),
+                             mode='r',
+                             shape=(meta['length'],),
+                             )
+        except (FileNotFoundError, ValueError):
+            self.remove(filepath)
+            return None
+        # mtime of the sample file tracks last use for LRU eviction
+        try:
+            os.utime(bin_path)
+        except FileNotFoundError:
+            # evicted by another worker, the mapping stays valid
+            pass
+        return data, meta
+
+    def put(
+            self,
+            filepath: Union[str, Path],
+            chunks: Iterable[np.ndarray],
+            dtype: Any,
+            length: int,
+            meta: dict,
+    ) -> Union[Tuple[np.memmap, dict], None]:
+        """
+        Write the samples for a source file into the cache and map them.
+
+        Chunks are streamed into a temporary file which is renamed into place\
+            once complete, so a partly written entry is never read.
+
+        Args:
+            filepath: Path to the source TDMS file.
+            chunks: Iterable of raw sample chunks making up the whole signal.
+            dtype: Data type of the raw samples.
+            length: Total number of samples.
+            meta: Extra metadata to store in the sidecar, e.g. gain/offset.
+
+        Returns:
+            Tuple of the memory-mapped raw samples and the sidecar metadata,\
+                or None if another worker evicted the entry before it was\
+                mapped, (the cache is too small for the files in use).
+        """
+        bin_path, meta_path = self._paths(filepath)
+        meta = dict(meta)
+        meta.update({'file': str(filepath),
+                     'dtype': np.dtype(dtype).str,
+                     'length': int(length),
+                     'source': _source_stat(filepath),
+                     })
+        self._evict(int(length) * np.dtype(dtype).itemsize)
+
+        tmp_path = bin_path.with_suffix(f'.bin.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            for chunk in chunks:
+                np.ascontiguousarray(chunk, dtype=dtype).tofile(f)
+        os.replace(tmp_path, bin_path)
+
+        tmp_path = meta_path.with_suffix(f'.json.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+        # map before evicting, other workers may have written since the
+        # first check
+        entry = self.get(filepath)
+        self._evict(keep=bin_path)
+        return entry
+
+    def remove(self, filepath: Union[str, Path]) -> None:
+        """
+        Remove the cache entry for a source file.
+
+        Args:
+            filepath: Path to the source TDMS file.
+        """
+        for path in self._paths(filepath)[::-1]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                # still mapped by another process (Windows), leave for later
+                pass
+
+    def _entries(self) -> list:
+        # (last use, size, path) of each sample file, oldest first
+        entries = []
+        for p in self.root.glob('*.bin'):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        return sorted(entries)
+
+    def size(self) -> int:
+        """Total size of the cached sample files in bytes, after eviction."""
+        self._evict()
+        return sum(e[1] for e in self._entries())
+
+    def _evict(
+            self,
+            incoming: int = 0,
+            keep: Union[Path, None] = None,
+    ) -> None:
+        """
+        Remove least recently used entries until there is room for `incoming`.
+
+        The cache is rescanned until it is under the cap, or nothing more can\
+            be removed, as other workers may be writing to it at the same time.
+
+        Args:
+            incoming: Size in bytes of the entry about to be added.
+            keep: Sample file never to evict, e.g. the entry just written.
+        """
+        while True:
+            entries = self._entries()
+            total = sum(e[1] for e in entries)
+            removed = False
+            for _, size, p in entries:
+                if total + incoming <= self.max_bytes:
+                    return
+                if p == keep:
+                    continue
+                try:
+                    os.remove(p.with_suffix('.json'))
+                    os.remove(p)
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    # still mapped by another process (Windows)
+                    continue
+                total -= size
+                removed = True
+            if total + incoming <= self.max_bytes or not removed:
+                return
+
+
+class SpectrumCache:
+    def __init__(self, root: Union[str, Path]) -> None:
+        """
+        Cache of averaged AE spectra, one file per AE file and trigger window.
+
+        Each entry is a `.npz` holding the spectrum at every resolution that\
+            has been calculated for that window, along with the size/mtime of\
+            the source file so the entry is ignored when the source changes.\
+            Spectra derived from a finer resolution are kept apart from the\
+            exact ones, so an exact lookup never returns a derived spectrum.
+
+        Args:
+            root: Directory to store the cache in.
+        """
+        self.root = Path(root)
+
+    def _path(self, filepath: Union[str, Path], window: Tuple) -> Path:
+        # v2, earlier entries could hold derived spectra as exact ones
+        key = _file_key(filepath, *window, 'v2')
+        return self.root.joinpath(f'{key}.npz')
+
+    def _load_arrays(self, filepath: Union[str, Path], window: Tuple) -> dict:
+        # every stored spectrum keyed by its npz name, empty if not valid
+        try:
+            with np.load(self._path(filepath, window)) as f:
+                source = {'size': int(f['source'][0]),
+                          'mtime': int(f['source'][1]),
+                          }
+                if source != _source_stat(filepath):
+                    return {}
+                return {k: f[k] for k in f.files if k != 'source'}
+        except (FileNotFoundError, OSError, ValueError, KeyError):
+            return {}
+
+    def load(
+            self,
+            filepath: Union[str, Path],
+            window: Tuple,
+            derived: bool = False,
+    ) -> dict:
+        """
+        Load the cached spectra for an AE file and trigger window.
+
+        Args:
+            filepath: Path to the source TDMS file.
+            window: Start and end sample of the trigger window, (slice\
+                semantics).
+            derived: Option to load the derived spectra instead of the exact\
+                ones.
+
+        Returns:
+            Dict of the cached spectra keyed by frequency resolution, empty if\
+                there is no valid entry.
+        """
+        prefix = 'drv_' if derived else 'res_'
+        return {float(k[4:]): v
+                for k, v in self._load_arrays(filepath, window).items()
+                if k.startswith(prefix)}
+
+    def save(
+            self,
+            filepath: Union[str, Path],
+            window: Tuple,
+            freqres: float,
+            spectrum: np.ndarray,
+            derived: bool = False,
+    ) -> None:
+        """
+        Add a spectrum to the cache entry for an AE file and trigger window.
+
+        Args:
+            filepath: Path to the source TDMS file.
+            window: Start and end sample of the trigger window.
+            freqres: Frequency resolution of the spectrum.
+            spectrum: Mean amplitude spectrum to store.
+            derived: Option to store the spectrum as derived from a finer\
+                resolution, rather than calculated directly.
+        """
+        spectra = self._load_arrays(filepath, window)
+        spectra[f'{"drv" if derived else "res"}_{float(freqres):g}'] = spectrum
+        source = _source_stat(filepath)
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(filepath, window)
+        tmp_path = path.with_suffix(f'.npz.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f,
+                     source=np.array([source['size'], source['mtime']],
+                                     dtype=np.int64),
+                     **spectra,
+                     )
+        os.replace(tmp_path, path)
+
+
+class EnvelopeCache:
+    def __init__(self, root: Union[str, Path]) -> None:
+        """
+        Cache of decimated min/max envelopes of AE files, for plotting.
+
+        Each entry is a `.npz` holding the number of samples, the block size\
+            and the min and max voltage of each block of the file, along\
+            with the size/mtime of the source file so the entry is ignored\
+            when the source changes.
+
+        Args:
+            root: Directory to store the cache in.
+        """
+        self.root = Path(root)
+
+    def _path(self, filepath: Union[str, Path]) -> Path:
+        return self.root.joinpath(f'{_file_key(filepath, "minmax")}.npz')
+
+    def load(
+            self,
+            filepath: Union[str, Path],
+    ) -> Union[Tuple[int, int, np.ndarray, np.ndarray], None]:
+        """
+        Load the cached envelope of an AE file.
+
+        Args:
+            filepath: Path to the source TDMS file.
+
+        Returns:
+            Tuple of the number of samples, the block size and the min and\
+                max of each block, or None if there is no valid entry.
+        """
+        try:
+            with np.load(self._path(filepath)) as f:
+                source = {'size': int(f['source'][0]),
+                          'mtime': int(f['source'][1]),
+                          }
+                if source != _source_stat(filepath):
+                    return None
+                return int(f['length']), int(f['block']), f['min'], f['max']
+        except (FileNotFoundError, OSError, ValueError, KeyError):
+            return None
+
+    def save(
+            self,
+            filepath: Union[str, Path],
+            length: int,
+            block: int,
+            mins: np.ndarray,
+            maxs: np.ndarray,
+    ) -> None:
+        """
+        Store the envelope of an AE file.
+
+        Args:
+            filepath: Path to the source TDMS file.
+            length: Number of samples in the file.
+            block: Number of samples in each block.
+            mins: Min voltage of each block.
+            maxs: Max voltage of each block.
+        """
+        source = _source_stat(filepath)
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(filepath)
+        tmp_path = path.with_suffix(f'.npz.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f,
+                     source=np.array([source['size'], source['mtime']],
+                                     dtype=np.int64),
+                     length=np.int64(length),
+                     block=np.int64(block),
+                     min=np.asarray(mins, dtype=np.float32),
+                     max=np.asarray(maxs, dtype=np.float32),
+                     )
+        os.replace(tmp_path, path)
+
+
+_SAMPLE_CACHE = {}
+
+
+def sample_cache() -> Union[SampleCache, None]:
+    """
+    Get the AE sample cache for this process, if one is configured.
+
+    The cache is enabled by setting the AE_CACHE_DIR environment variable,\
+        see `config.cache_config`.
+
+    Returns:
+        Shared SampleCache object, or None if caching is disabled.
+    """
+    cache_dir, max_bytes = config.cache_config()
+    if cache_dir is None:
+        return None
+    key = (str(cache_dir), max_bytes)
+    if key not in _SAMPLE_CACHE:
+        _SAMPLE_CACHE[key] = SampleCache(cache_dir.joinpath('samples'),
+                                         max_bytes,
+                                         )
+    return _SAMPLE_CACHE[key]
+
+
+def spectrum_cache(default_dir: Union[str, Path]) -> SpectrumCache:
+    """
+    Get the AE spectrum cache, in the local cache directory if one is\
+        configured, otherwise in `default_dir`.
+
+    Args:
+        default_dir: Directory to use without a local cache, e.g. the\
+            experiment's AE folder.
+
+    Returns:
+        SpectrumCache object.
+    """
+    cache_dir, _ = config.cache_config()
+    if cache_dir is None:
+        return SpectrumCache(default_dir)
+    return SpectrumCache(cache_dir.joinpath('spectra'))
+
+
+def envelope_cache() -> Union[EnvelopeCache, None]:
+    """
+    Get the AE envelope cache, if a local cache directory is configured.
+
+    Unlike the spectra, envelopes are never written next to the data, as\
+        they are only a shortcut for plotting.
+
+    Returns:
+        EnvelopeCache object, or None if caching is disabled.
+    """
+    cache_dir, _ = config.cache_config()
+    if cache_dir is None:
+        return None
+    return EnvelopeCache(cache_dir.joinpath('envelopes'))
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+"""
+Min/max level of detail plotting.
+"""
+
+from typing import Any, Tuple, Union
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+def _raw_scaling(y: Any) -> Tuple[np.ndarray, float, float]:
+    # AESignal keeps raw samples and a deferred scaling, arrays are volts
+    if hasattr(y, 'raw'):
+        return y.raw, y.scale, y.offset
+    return np.asarray(y), 1.0, 0.0
+
+
+def minmax_blocks(
+        y: Any,
+        block: int,
+        start: int = 0,
+        stop: Union[int, None] = None,
+        chunk_size: int = 4_000_000,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Min and max of each block of a signal, a chunk at a time.
+
+    For an AESignal the reduction runs on the raw samples and only the\
+        results are scaled to volts.
+
+    Args:
+        y: Signal, either an array or an AESignal.
+        block: Number of samples in each block.
+        start: Index of the first sample.
+        stop: Index after the last sample, default the end of the signal.
+        chunk_size: Number of samples reduced at a time.
+
+    Returns:
+        Tuple of the min and max of each block, the last block holding the\
+            samples left over.
+    """
+    raw, scale, offset = _raw_scaling(y)
+    stop = len(raw) if stop is None else min(stop, len(raw))
+    n = max(stop - start, 0)
+    mins = np.empty(-(-n // block))
+    maxs = np.empty(len(mins))
+    step = max(chunk_size // block, 1) * block
+    for i in range(0, n, step):
+        c = raw[start + i:start + min(i + step, n)]
+        idx = np.arange(0, len(c), block)
+        o = i // block
+        mins[o:o + len(idx)] = np.minimum.reduceat(c, idx)
+        maxs[o:o + len(idx)] = np.maximum.reduceat(c, idx)
+    if scale < 0:
+        mins, maxs = maxs, mins
+    return mins * scale + offset, maxs * scale + offset
+
+
+class LODLine:
+    def __init__(
+            self,
+            ax: plt.Axes,
+            y: Any,
+            fs: float = 1.0,
+            t0: float = 0.0,
+            envelope: Union[Tuple[int, np.ndarray, np.ndarray], None] = None,
+            n: Union[int, None] = None,
+            **kwargs: Any,
+    ) -> None:
+        """
+        Plot a long signal as a min/max envelope with one column per pixel.
+
+        Only `2 x width` points are drawn at any time. When the x limits\
+            change the visible window is re-decimated, from the envelope\
+            when it is fine enough, otherwise from the signal, and once\
+            fewer samples than pixels are visible the samples themselves\
+            are drawn. With a loader for `y` only the visible window is read\
+            and only once zoomed in past the envelope.
+
+        Args:
+            ax: Axes to plot on.
+            y: Signal to plot, either an array, an AESignal or a loader\
+                `y(start, stop)` returning either for a window of samples.
+            fs: Sample rate of the signal, for the time axis.
+            t0: Time of the first sample.
+            envelope: Optional decimated envelope of the whole signal, as the\
+                block size and the min and max of each block, e.g. from the\
+                envelope cache. It is calculated when not given.
+            n: Number of samples in the signal, needed with a loader.
+            kwargs: Extra arguments for `ax.plot`.
+        """
+        self.ax = ax
+        self.y = y
+        self.fs = fs
+        self.t0 = t0
+        if n is None:
+            if callable(y):
+                raise ValueError('The signal length is needed with a loader.')
+            n = len(_raw_scaling(y)[0])
+        self.n = n
+        if envelope is None:
+            block = max(self.n // 4_096, 1)
+            envelope = (block, *minmax_blocks(self._window(0, n), block))
+        self.envelope = envelope
+        self.line, = ax.plot([], [], **kwargs)
+        # the axes callbacks only hold a weak reference, keep this object
+        # alive for as long as its line is
+        self.line._lod = self
+
+        ax.set_xlim(t0, t0 + self.n / fs)
+        lo, hi = np.nanmin(envelope[1]), np.nanmax(envelope[2])
+        pad = 0.05 * (hi - lo) if hi > lo else 1.0
+        ax.set_ylim(lo - pad, hi + pad)
+        self.update(ax)
+        self.cid = ax.callbacks.connect('xlim_changed', self.update)
+
+    def _window(self, i0: int, i1: int) -> Any:
+        """Samples `i0` to `i1` of the signal, from the loader if given."""
+        if callable(self.y):
+            return self.y(i0, i1)
+        return self.y[i0:i1]
+
+    def _columns(self) -> int:
+        # width of the axes in pixels, with a floor for unrealised figures
+        return max(int(self.ax.bbox.width), 200)
+
+    def update(self, ax: plt.Axes) -> None:
+        """
+        Redraw the visible window of the signal, (xlim_changed callback).
+
+        Args:
+            ax: Axes whose limits changed.
+        """
+        x0, x1 = ax.get_xlim()
+        i0 = max(int(np.floor((x0 - self.t0) * self.fs)), 0)
+        i1 = min(int(np.ceil((x1 - self.t0) * self.fs)) + 1, self.n)
+        if i1 <= i0:
+            self.line.set_data([], [])
+            return
+        cols = self._columns()
+        if i1 - i0 <= 2 * cols:
+            raw, scale, offset = _raw_scaling(self._window(i0, i1))
+            y = raw * scale + offset
+            x = self.t0 + np.arange(i0, i1) / self.fs
+        else:
+            x, y = self._minmax(i0, i1, max((i1 - i0) // cols, 1))
+        self.line.set_data(x, y)
+        ax.figure.canvas.draw_idle()
+
+    def _minmax(self, i0: int, i1: int, block: int) -> Tuple[Any, Any]:
+        """
+        Interleaved min/max of each block of the visible window.
+
+        Args:
+            i0: Index of the first visible sample.
+            i1: Index after the last visible sample.
+            block: Number of samples in each block, one per pixel column.
+
+        Returns:
+            Tuple of the x and y data, two points per block.
+        """
+        eblock, emins, emaxs = self.envelope
+        if block >= eblock:
+            # aggregate whole blocks of the envelope
+            k = block // eblock
+            b0, b1 = i0 // eblock, -(-i1 // eblock)
+            idx = np.arange(0, b1 - b0, k)
+            mins = np.minimum.reduceat(emins[b0:b1], idx)
+            maxs = np.maximum.reduceat(emaxs[b0:b1], idx)
+            starts = (b0 + idx) * eblock
+        else:
+            mins, maxs = minmax_blocks(self._window(i0, i1), block)
+            starts = i0 + np.arange(len(mins)) * block
+        x = np.repeat(self.t0 + starts / self.fs, 2)
+        y = np.empty(2 * len(mins))
+        y[0::2] = mins
+        y[1::2] = maxs
+        return x, y
+
+    def remove(self) -> None:
+        """Remove the line and disconnect its callback."""
+        self.ax.callbacks.disconnect(self.cid)
+        self.line.remove()
+
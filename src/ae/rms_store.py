@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+"""
+Binary columnar store for AE RMS.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+class RMSStore:
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Columnar store of the RMS of each AE file, (rolling or block RMS).
+
+        The RMS is held in a float32 `.npy` matrix with one row per column of\
+            the RMS DataFrame, so every cut is contiguous on disk, and a\
+            `.json` sidecar holding the column labels. The matrix is\
+            memory-mapped and only the columns and rows asked for are read.
+
+        Args:
+            path: Location of the `.npy` file.
+        """
+        self.path = Path(path)
+        with open(self.path.with_suffix('.json'), 'r') as f:
+            meta = json.load(f)
+        self.columns = [str(c) for c in meta['columns']]
+        self.meta = meta.get('meta', {})
+        self._matrix = None
+
+    @staticmethod
+    def exists(path: Union[str, Path]) -> bool:
+        """Check if a complete store has been written to `path`."""
+        path = Path(path)
+        return path.exists() and path.with_suffix('.json').exists()
+
+    @classmethod
+    def write(
+            cls,
+            path: Union[str, Path],
+            data: Union[pd.DataFrame, np.ndarray],
+            columns: Union[Sequence, None] = None,
+            meta: Union[dict, None] = None,
+    ) -> 'RMSStore':
+        """
+        Write RMS data to a new store, replacing any existing one.
+
+        Both files are written to temporary names and renamed into place,\
+            sidecar last, so a partly written store is never opened.
+
+        Args:
+            path: Location of the `.npy` file.
+            data: RMS DataFrame, (samples x files), or an array of the RMS\
+                of each file, (files x samples).
+            columns: Labels of each file, default the DataFrame columns or\
+                the file number.
+            meta: Extra json metadata to store in the sidecar, e.g. the\
+                block size.
+
+        Returns:
+            The written store.
+        """
+        path = Path(path)
+        if isinstance(data, pd.DataFrame):
+            columns = data.columns if columns is None else columns
+            data = data.to_numpy().T
+        matrix = np.ascontiguousarray(data, dtype=np.float32)
+        if columns is None:
+            columns = range(len(matrix))
+        columns = [str(c) for c in columns]
+        if len(columns) != len(matrix):
+            raise ValueError(f'{len(columns)} column labels given for '
+                             f'{len(matrix)} columns.')
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.npy.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, matrix)
+        os.replace(tmp_path, path)
+
+        meta_path = path.with_suffix('.json')
+        tmp_path = meta_path.with_suffix(f'.json.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'columns': columns,
+                       'shape': list(matrix.shape),
+                       'meta': meta or {},
+                       }, f)
+        os.replace(tmp_path, meta_path)
+        return cls(path)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Memory-mapped RMS, (files x samples)."""
+        if self._matrix is None:
+            self._matrix = np.load(self.path, mmap_mode='r')
+        return self._matrix
+
+    @property
+    def shape(self) -> tuple:
+        """Shape of the RMS DataFrame, (samples x files)."""
+        return self.matrix.shape[::-1]
+
+    def _column_index(self, columns: Union[Sequence, None]) -> list:
+        if columns is None:
+            return list(range(len(self.columns)))
+        lookup = {c: i for i, c in enumerate(self.columns)}
+        try:
+            return [lookup[str(c)] for c in columns]
+        except KeyError as e:
+            raise KeyError(f'RMS column {e} not in {self.path.name}') from None
+
+    def select(
+            self,
+            columns: Union[Sequence, None] = None,
+            rows: Union[slice, Sequence[int], None] = None,
+    ) -> pd.DataFrame:
+        """
+        Load part of the RMS data.
+
+        Values are stored as float32 and returned as float64, as read from\
+            the old AE_RMS.csv.
+
+        Args:
+            columns: Labels of the files to load, default all.
+            rows: Slice or indices of the RMS samples to load, default all.
+
+        Returns:
+            DataFrame of the selected RMS, (samples x files), indexed by the\
+                sample number.
+        """
+        idx = self._column_index(columns)
+        rows = slice(None) if rows is None else rows
+        index = np.arange(self.matrix.shape[1])[rows]
+        block = np.empty((len(idx), len(index)), dtype=np.float64)
+        for i, col in enumerate(idx):
+            block[i] = self.matrix[col, rows]
+        return pd.DataFrame(block.T,
+                            index=index,
+                            columns=[self.columns[i] for i in idx],
+                            )
+
+    def to_csv(self, path: Union[str, Path], **kwargs: Any) -> None:
+        """
+        Export the RMS data to a csv, in the layout of the old AE_RMS.csv.
+
+        Args:
+            path: Location of the csv file.
+            kwargs: Extra arguments for `DataFrame.to_csv`.
+        """
+        kwargs.setdefault('index', False)
+        kwargs.setdefault('encoding', 'utf-8')
+        self.select().to_csv(path, **kwargs)
+
+    def __repr__(self) -> str:
+        return (f'RMSStore({self.path.name}, {len(self.columns)} files x '
+                f'{self.matrix.shape[1]} samples)')
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+"""
+Compact matrix of AE spectra.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Union
+
+import numpy as np
+
+
+class Spectrum:
+    def __init__(
+            self,
+            freqres: float,
+            fs: float,
+            data: Any = None,
+            dtype: Any = np.float32,
+    ) -> None:
+        """
+        Matrix of the spectrum of each AE file, (files x bins).
+
+        Rows are stored in one contiguous array which grows as files are\
+            appended. It can be saved to a `.npy` file and memory-mapped, in\
+            which case only the path is pickled with the experiment.
+
+        Args:
+            freqres: Frequency resolution of the spectra. (Hz)
+            fs: Sample rate of the AE signals. (Hz)
+            data: Initial spectra, either a 2D array or a list of rows.
+            dtype: Data type to store the spectra as.
+        """
+        self.freqres = freqres
+        self.fs = fs
+        self.path = None
+        self._n = 0
+        self._data = np.empty((0, self.n_bins), dtype=dtype)
+        if data is not None and len(data):
+            self.append(data)
+
+    @classmethod
+    def open(cls, path: Union[str, Path], freqres: float, fs: float
+             ) -> 'Spectrum':
+        """
+        Memory-map a spectrum matrix previously written with `save`.
+
+        Args:
+            path: Location of the `.npy` file.
+            freqres: Frequency resolution of the spectra. (Hz)
+            fs: Sample rate of the AE signals. (Hz)
+
+        Returns:
+            Read-only Spectrum backed by the file.
+        """
+        spec = cls(freqres, fs)
+        spec.path = Path(path)
+        spec._data = np.load(spec.path, mmap_mode='r')
+        spec._n = spec._data.shape[0]
+        return spec
+
+    @property
+    def n_bins(self) -> int:
+        """Number of frequency bins in each spectrum."""
+        return int(self.fs / self.freqres) // 2
+
+    @property
+    def freq(self) -> np.ndarray:
+        """Frequency of each bin. (Hz)"""
+        return np.arange(self.n_bins) * self.freqres
+
+    @property
+    def data(self) -> np.ndarray:
+        """View of the stored spectra, (files x bins)."""
+        return self._data[:self._n]
+
+    @property
+    def shape(self) -> tuple:
+        return self.data.shape
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, item: Any) -> np.ndarray:
+        return self.data[item]
+
+    def __iter__(self) -> Any:
+        return iter(self.data)
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        if dtype is None and not copy:
+            return self.data
+        return np.array(self.data, dtype=dtype)
+
+    def append(self, rows: Any) -> None:
+        """
+        Add the spectra of new files to the end of the matrix.
+
+        Capacity is doubled when full, so adding files one at a time is\
+            amortised constant cost.
+
+        Args:
+            rows: Spectrum, or 2D array/list of spectra, to add.
+        """
+        rows = np.asarray(rows, dtype=self._data.dtype)
+        if rows.ndim == 1:
+            rows = rows[np.newaxis]
+        if rows.shape[1] != self.n_bins:
+            raise ValueError(f'Spectra have {rows.shape[1]} bins, expected '
+                             f'{self.n_bins} for {self.freqres} Hz resolution.'
+                             )
+        n = self._n + len(rows)
+        if self.path is not None or n > len(self._data):
+            data = np.empty((max(n, 2 * len(self._data)), self.n_bins),
+                            dtype=self._data.dtype,
+                            )
+            data[:self._n] = self.data
+            self._data = data
+            self.path = None
+        self._data[self._n:n] = rows
+        self._n = n
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write the spectra to a `.npy` file and memory-map it.
+
+        Args:
+            path: Location to save the `.npy` file.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.npy.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, self.data)
+        os.replace(tmp_path, path)
+        self.path = path
+        self._data = np.load(path, mmap_mode='r')
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        if self.path is not None:
+            state['_data'] = None
+        else:
+            state['_data'] = np.ascontiguousarray(self.data)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if self.path is not None:
+            self._data = np.load(self.path, mmap_mode='r')
+
+    def __repr__(self) -> str:
+        return (f'Spectrum({self._n} files x {self.n_bins} bins, '
+                f'{self.freqres} Hz)')
@@ -57,3 +57,25 @@ def config_paths():
                                      r'RMS',
                                      )
     return HOME_DIR, BASE_DIR, CODE_DIR, TB_DIR, RMS_DATA_DIR
+
+
+def cache_config():
+    """
+    Find the optional local cache directory for processed AE data.
+
+    The cache is opt-in and only used when the AE_CACHE_DIR environment\
+        variable is set, ideally to a fast local disk rather than OneDrive.
+
+    CACHE_DIR, CACHE_MAX_BYTES = .cache_config()
+
+    Returns:
+        CACHE_DIR (pathlib.Path | None): Cache directory, None if disabled.
+        CACHE_MAX_BYTES (int): Size cap for the cache, from AE_CACHE_MAX_GB\
+            (default 50 GB).
+    """
+    cache_dir = os.environ.get('AE_CACHE_DIR')
+    if not cache_dir:
+        return None, 0
+    CACHE_DIR = Path(cache_dir).expanduser()
+    CACHE_MAX_BYTES = int(float(os.environ.get('AE_CACHE_MAX_GB', 50)) * 1E9)
+    return CACHE_DIR, CACHE_MAX_BYTES
@@ -241,6 +241,7 @@ class Experiment:
         save_path = CODE_DIR.joinpath(self.test_info.dataloc)
         save_path = save_path.joinpath(f'Test {self.test_info.testno}.pickle')
         # assert os.path.isfile(save_path)
+        self.nc4.save_radius()
         with open(fr'{save_path}', 'wb') as f:
             pickle.dump(self, f)
 
@@ -342,7 +343,7 @@ class Experiment:
                       self.nc4.runout,
                       self.nc4.form_error
                       ])
-        f = np.array(self.ae.fft[freq])
+        f = np.asarray(self.ae.spectra(freq))
         f = f.transpose()
         coeff = np.corrcoef(f, r[:, -np.shape(f)[1]:])[:-4, -4:]
         fig = []
@@ -391,7 +392,7 @@ class Experiment:
         amp = np.concatenate(([np.NaN], self.ae.amplitude))
         skew = np.concatenate(([np.NaN], self.ae.skewness))
 
-        f = np.array(self.ae.fft[1000])
+        f = np.asarray(self.ae.spectra(1000))
         f = f.T
         f_35 = np.concatenate(([np.NaN], f[35]))
         f_10 = np.concatenate(([np.NaN], f[10]))
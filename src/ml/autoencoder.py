@@ -38,6 +38,7 @@ from scikeras.wrappers import KerasRegressor, BaseWrapper
 
 # local imports
 import src
+from src.ae.ae import build_rms
 
 HOME_DIR, BASE_DIR, CODE_DIR, TB_DIR, RMS_DATA_DIR = src.config_paths()
 
@@ -1581,9 +1582,8 @@ if __name__ == '__main__':
     # exps = ['Test 5', 'Test 7', 'Test 8', 'Test 9']
     exps = ['Test 7']
 
-    rms = {}
+    rms = build_rms(exps)
     for test in exps:
-        rms[test] = src.ae.RMS(test)
         rms[test].data.drop(['0', '1', '2'], axis=1, inplace=True)
     try:
         rms['Test 5'].data.drop(['23', '24'], axis=1, inplace=True)
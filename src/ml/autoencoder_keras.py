@@ -15,6 +15,7 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import MinMaxScaler
 
 import src
+from src.ae.ae import build_rms
 
 # Get Project Paths
 HOME_DIR, BASE_DIR, CODE_DIR, TB_DIR, RMS_DATA_DIR = src.config_paths()
@@ -221,9 +222,8 @@ if __name__ == '__main__':
 
     # tf.config.set_visible_devices([], 'GPU')
     exps = ['Test 8']
-    rms = {}
+    rms = build_rms(exps)
     for test in exps:
-        rms[test] = src.ae.RMS(test)
         rms[test].data.drop(['0', '1', '2'], axis=1, inplace=True)
 
     # remove outside triggers and DC offset
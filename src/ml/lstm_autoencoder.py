@@ -6,6 +6,7 @@ os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 import tensorflow as tf
 from autoencoder import LSTMAutoEncoder
 import src
+from src.ae.ae import build_rms
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
@@ -29,10 +30,9 @@ if __name__ == '__main__':
 
     exps = ['Test 5', 'Test 7', 'Test 8', 'Test 9']
     # exps = ['Test 5']
-    rms = {}
+    rms = build_rms(exps)
 
     for test in exps:
-        rms[test] = src.ae.RMS(test)
         rms[test].data.drop(['0', '1', '2'], axis=1, inplace=True)
     
     try:
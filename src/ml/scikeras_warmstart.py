@@ -3,6 +3,7 @@ os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 import tensorflow as tf
 from autoencoder import LSTMAutoEncoder, load_model
 import src
+from src.ae.ae import build_rms
 import numpy as np
 import pandas as pd
 from pathlib import PurePosixPath as Path
@@ -24,10 +25,9 @@ if __name__ == '__main__':
     print(f'TB logdir: {TB_DIR}')
 
     exps = ['Test 5', 'Test 7', 'Test 8', 'Test 9']
-    rms = {}
+    rms = build_rms(exps)
 
     for test in exps:
-        rms[test] = src.ae.RMS(test)
         rms[test].data.drop(['0', '1', '2'], axis=1, inplace=True)
     
     try:
@@ -0,0 +1,638 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+"""
+Vectorised NC4 processing kernels.
+"""
+
+import math
+from typing import Callable, Union
+
+import numpy as np
+from scipy import fft
+from scipy.ndimage import uniform_filter1d
+
+# NC4 measurement geometry, a scan is made of sections at each y step, first
+# positive then negative, each lasting `RPY` revolutions with a gap between
+FILT = 50
+YSTEPS = np.around(np.arange(0.04, -0.02, -0.01), 2)
+RPY = 4
+SPR = 1
+CLIP = 0.5
+GAP = 0.4
+
+# NC4 calibration, radius offset (mm) as a polynomial of the voltage
+PVAL = [-0.000341717477186167,
+        0.00459433449011791,
+        -0.0237307202784755,
+        0.0585315537400639,
+        -0.0766338436136931,
+        5.15045955887124
+        ]
+
+
+def section_geometry(fs: float) -> dict:
+    """
+    Sample counts describing the sections of an NC4 scan.
+
+    Args:
+        fs: Sample rate of the NC4 acquisition.
+
+    Returns:
+        Dict of the number of sections, samples per section, samples in the\
+            gap between positive and negative, total samples in the scan and\
+            the start/end of the unclipped part of each section.
+    """
+    ts = 1 / fs
+    nosections = int(2 * len(YSTEPS))
+    lentime = float(nosections) * RPY * SPR + GAP
+    seclensamples = math.ceil(RPY * SPR / ts)
+    return {'nosections': nosections,
+            'seclen': seclensamples,
+            'gap': int(GAP / ts),
+            'len': int(lentime / ts),
+            'vs': math.ceil((CLIP * SPR) / ts) - 1,
+            've': int(seclensamples - ((CLIP * SPR) / ts)) - 1,
+            }
+
+
+def scale_voltage(
+        vfilter: np.ndarray,
+        vmin: float,
+        vmax: float,
+) -> np.ndarray:
+    """
+    Scale a filtered NC4 signal in place to the 0-5 V range.
+
+    Args:
+        vfilter: Filtered NC4 signal, overwritten with the result.
+        vmin: Minimum of the filtered signal.
+        vmax: Maximum of the filtered signal.
+
+    Returns:
+        The scaled signal.
+    """
+    np.subtract(vfilter, vmin, out=vfilter)
+    np.divide(vfilter, vmax - vmin, out=vfilter)
+    np.multiply(vfilter, 5, out=vfilter)
+    return vfilter
+
+
+def normalise_voltage(data: np.ndarray, filt: int = FILT) -> np.ndarray:
+    """
+    Smooth an NC4 signal and scale it to the 0-5 V range.
+
+    Args:
+        data: NC4 voltage signal.
+        filt: Size of the moving average filter.
+
+    Returns:
+        Filtered signal normalised between 0 and 5.
+    """
+    vfilter = uniform_filter1d(np.asarray(data, dtype=np.float64), size=filt)
+    return scale_voltage(vfilter, np.amin(vfilter), np.amax(vfilter))
+
+
+def filter_window(
+        read: Callable[[int, int], np.ndarray],
+        n: int,
+        start: int,
+        stop: int,
+        filt: int = FILT,
+) -> np.ndarray:
+    """
+    Moving average of part of a signal, matching a filter of the whole\
+        signal.
+
+    Only the window plus a margin of `filt` samples either side is read,\
+        so the filter never sees an edge which isn't an edge of the signal.
+
+    Args:
+        read: Function reading `length` samples from `offset` of the signal\
+            as float64, `read(offset, length)`.
+        n: Number of samples in the signal.
+        start: Index of the first sample of the window.
+        stop: Index after the last sample of the window.
+        filt: Size of the moving average filter.
+
+    Returns:
+        Filtered signal between `start` and `stop`.
+    """
+    lo, hi = max(start - filt, 0), min(stop + filt, n)
+    data = np.asarray(read(lo, hi - lo), dtype=np.float64)
+    return uniform_filter1d(data, size=filt)[start - lo:stop - lo]
+
+
+def filtered_range(
+        read: Callable[[int, int], np.ndarray],
+        n: int,
+        start: int = 0,
+        stop: Union[int, None] = None,
+        filt: int = FILT,
+        chunk: int = 2_000_000,
+) -> tuple[float, float]:
+    """
+    Min and max of the moving average of a signal, read a chunk at a time.
+
+    Args:
+        read: Function reading `length` samples from `offset` of the signal\
+            as float64, `read(offset, length)`.
+        n: Number of samples in the signal.
+        start: Index of the first sample to include.
+        stop: Index after the last sample to include, default end of signal.
+        filt: Size of the moving average filter.
+        chunk: Number of samples filtered at a time.
+
+    Returns:
+        Tuple of the min and max of the filtered signal.
+    """
+    stop = n if stop is None else stop
+    vmin, vmax = np.inf, -np.inf
+    for pos in range(start, stop, chunk):
+        v = filter_window(read, n, pos, min(pos + chunk, stop), filt)
+        vmin, vmax = min(vmin, np.amin(v)), max(vmax, np.amax(v))
+    return vmin, vmax
+
+
+def section_samples(
+        voltage: np.ndarray,
+        fs: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Cut the unclipped part of each section from the end of an NC4 scan.
+
+    Sections are returned as views into the voltage array, with the\
+        negative half offset by the gap. The voltage is padded with zeros\
+        at most once, if it is shorter than the scan.
+
+    Args:
+        voltage: Normalised NC4 signal.
+        fs: Sample rate of the NC4 acquisition.
+
+    Returns:
+        Tuple of the positive and negative section samples, each as an\
+            array of (sections x samples).
+    """
+    g = section_geometry(fs)
+    nosec, seclen, gap = g['nosections'], g['seclen'], g['gap']
+    half = nosec - nosec // 2
+
+    voltage = voltage[-(g['len'] + 1):]
+    end = nosec * seclen + gap
+    if end > len(voltage):
+        voltage = np.pad(voltage, (0, end - len(voltage)), 'constant')
+
+    pos = voltage[:half * seclen].reshape(half, seclen)
+    neg = voltage[half * seclen + gap:end].reshape(nosec - half, seclen)
+    return pos[:, g['vs']:g['ve']], neg[:, g['vs']:g['ve']]
+
+
+def select_sections(
+        pos: np.ndarray,
+        neg: np.ndarray,
+) -> tuple[np.ndarray, float, np.ndarray, float]:
+    """
+    Pick the positive and negative sections closest to the middle of the\
+        sensor range.
+
+    Args:
+        pos: Positive section samples, (sections x samples).
+        neg: Negative section samples, (sections x samples).
+
+    Returns:
+        A tuple containing the signal sample and y position for both the \
+            positive and negative signal.
+    """
+    psec = np.argmin(np.sum((pos - 2.5) ** 2, axis=1))
+    nsec = np.argmin(np.sum((neg - 2.5) ** 2, axis=1))
+    return pos[psec].copy(), YSTEPS[psec], neg[nsec].copy(), YSTEPS[nsec]
+
+
+def sampleandpos(
+        data: np.ndarray,
+        fs: float,
+) -> tuple[np.ndarray, float, np.ndarray, float]:
+    """
+    Select the positive and negative sections of an NC4 scan closest to the\
+        middle of the sensor range.
+
+    Args:
+        data: NC4 voltage signal from the TDMS file.
+        fs: Sample rate of the NC4 acquisition.
+
+    Returns:
+        A tuple containing the signal sample and y position for both the \
+            positive and negative signal.
+    """
+    return select_sections(*section_samples(normalise_voltage(data), fs))
+
+
+def tail_sampleandpos(
+        read: Callable[[int, int], np.ndarray],
+        n: int,
+        fs: float,
+        tail_range: bool = False,
+        chunk: int = 2_000_000,
+) -> tuple[np.ndarray, float, np.ndarray, float]:
+    """
+    Select the positive and negative sections of an NC4 scan, reading only\
+        the end of the signal which holds the scan.
+
+    The scan and a filter margin are read and filtered in one go. The\
+        normalisation range is then either the range of the scan itself,\
+        or that of the whole signal as in `sampleandpos`, found with a\
+        chunked pass over the lead-in which never holds it all in memory.
+
+    Args:
+        read: Function reading `length` samples from `offset` of the NC4\
+            signal as float64, `read(offset, length)`.
+        n: Number of samples in the signal.
+        fs: Sample rate of the NC4 acquisition.
+        tail_range: Option to normalise to the range of the scan only,\
+            skipping the lead-in entirely.
+        chunk: Number of lead-in samples filtered at a time.
+
+    Returns:
+        A tuple containing the signal sample and y position for both the \
+            positive and negative signal.
+    """
+    start = max(n - (section_geometry(fs)['len'] + 1), 0)
+    vfilter = filter_window(read, n, start, n)
+    vmin, vmax = np.amin(vfilter), np.amax(vfilter)
+    if start and not tail_range:
+        lmin, lmax = filtered_range(read, n, 0, start, chunk=chunk)
+        vmin, vmax = min(vmin, lmin), max(vmax, lmax)
+    scale_voltage(vfilter, vmin, vmax)
+    return select_sections(*section_samples(vfilter, fs))
+
+
+def radius_lut(
+        diameter: float,
+        size: int = 4_096,
+        vrange: tuple[float, float] = (0, 5),
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Lookup table of the NC4 calibration for `polyval_radius`.
+
+    Args:
+        diameter: Diameter of the DCB. (mm)
+        size: Number of points in the table.
+        vrange: Range of voltages covered by the table.
+
+    Returns:
+        Tuple of the table voltages and radius, (without the y offset).
+    """
+    v = np.linspace(vrange[0], vrange[1], size)
+    return v, polyval_radius(v, 0.0, diameter)
+
+
+def polyval_radius(
+        samples: np.ndarray,
+        ypos: Union[np.ndarray, float],
+        diameter: float,
+        lut: Union[tuple[np.ndarray, np.ndarray], None] = None,
+        out: Union[np.ndarray, None] = None,
+) -> np.ndarray:
+    """
+    Convert NC4 voltage signals to radius, using NC4 calibration constants.
+
+    The polynomial is evaluated with Horner's method in a single output\
+        array, giving the same result as `np.polyval` row by row. With a\
+        lookup table from `radius_lut` the calibration is linearly\
+        interpolated instead, which is only faster for a higher order\
+        calibration than the current 5th order polynomial.
+
+    Args:
+        samples: Voltage signal, or array of signals (signals x samples).
+        ypos: Y position of the signal, or of each row of signals. (mm)
+        diameter: Diameter of the DCB. (mm)
+        lut: Optional lookup table of the calibration.
+        out: Optional array to write the radius into, can be `samples`.
+
+    Returns:
+        Radius of each sample. (mm)
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    ypos = np.asarray(ypos, dtype=np.float64)
+    if samples.ndim == 2 and ypos.ndim == 1:
+        ypos = ypos[:, np.newaxis]
+
+    if lut is not None:
+        # linear interpolation on the uniform grid of the table
+        v, table = lut
+        pos = samples - v[0]
+        pos *= (len(v) - 1) / (v[-1] - v[0])
+        idx = pos.astype(np.intp)
+        np.clip(idx, 0, len(v) - 2, out=idx)
+        pos -= idx
+        pos *= np.diff(table).take(idx)
+        out = np.add(table.take(idx), pos, out=out)
+        out += ypos
+        return out
+
+    if out is samples:
+        x = samples.copy()
+    else:
+        x = samples
+    if out is None:
+        out = np.empty_like(samples)
+    out.fill(PVAL[0])
+    for c in PVAL[1:]:
+        out *= x
+        out += c
+    out -= 5.1
+    out += diameter / 2
+    out += ypos
+    return out
+
+
+def batch_shift(
+        x: np.ndarray,
+        y: np.ndarray,
+        chunk: int = 4,
+        demean: bool = False,
+) -> np.ndarray:
+    """
+    Use fft correlation to compute the shift between each pair of rows.
+
+    The correlation of each pair is done by one row-wise rfft/irfft per\
+        chunk of rows, padded to a fast fft length.
+
+    Args:
+        x: Array of signals, (signals x samples).
+        y: Array of signals to compare with the rows of `x`.
+        chunk: Number of rows to correlate at a time, to limit memory use.
+        demean: Option to remove the mean of each row before correlating,\
+            done a chunk at a time rather than on a copy of the inputs.
+
+    Returns:
+        Array of the number of samples of shift between each pair of rows.
+    """
+    x = np.atleast_2d(x)
+    y = np.atleast_2d(y)
+    assert x.shape == y.shape
+    n = x.shape[1]
+    nfft = fft.next_fast_len(2 * n - 1, real=True)
+    # lags covered by mode='same' correlation, as indices of the circular
+    # correlation
+    lags = np.arange(n) + (n - 1) // 2 - (n - 1)
+    lags %= nfft
+    zero_index = int(n / 2) - 1
+
+    shift = np.empty(len(x), dtype=int)
+    for i in range(0, len(x), chunk):
+        xc = x[i:i + chunk]
+        yc = y[i:i + chunk]
+        if demean:
+            xc = xc - xc.mean(axis=1, keepdims=True)
+            yc = yc - yc.mean(axis=1, keepdims=True)
+        xf = fft.rfft(xc, n=nfft, axis=1, workers=-1)
+        xf *= np.conj(fft.rfft(yc, n=nfft, axis=1, workers=-1))
+        c = fft.irfft(xf, n=nfft, axis=1, workers=-1)
+        shift[i:i + chunk] = zero_index - np.argmax(c[:, lags], axis=1)
+    return shift
+
+
+def gather_rows(
+        x: np.ndarray,
+        shifts: np.ndarray,
+        start: int = 0,
+        length: Union[int, None] = None,
+        out: Union[np.ndarray, None] = None,
+        chunk: int = 8,
+) -> np.ndarray:
+    """
+    Roll each row of an array by its own shift and crop it, in one gather.
+
+    Row `i` of the output is `np.roll(x[i], -shifts[i])[start:start +\
+        length]`, with the crop wrapping around the end of the row. The\
+        indices are built a chunk of rows at a time and the samples taken\
+        straight into the output.
+
+    Args:
+        x: Array of signals, (signals x samples).
+        shifts: Number of samples to shift each row to the left.
+        start: Index of the first sample to keep after shifting.
+        length: Number of samples to keep, the whole row if None.
+        out: Optional preallocated output array, (signals x length).
+        chunk: Number of rows to gather at a time.
+
+    Returns:
+        Array of the shifted and cropped rows.
+    """
+    x = np.ascontiguousarray(x)
+    shifts = np.asarray(shifts, dtype=np.intp)
+    m = x.shape[1]
+    if length is None:
+        length = m
+    if out is None:
+        out = np.empty((len(x), length), dtype=x.dtype)
+    cols = np.arange(start, start + length, dtype=np.intp)
+    for i in range(0, len(x), chunk):
+        rows = x[i:i + chunk]
+        idx = cols + shifts[i:i + chunk, np.newaxis]
+        idx %= m
+        idx += np.arange(len(rows), dtype=np.intp)[:, np.newaxis] * m
+        np.take(rows, idx, out=out[i:i + chunk])
+    return out
+
+
+def align_posneg(
+        prad: np.ndarray,
+        nrad: np.ndarray,
+        out: Union[np.ndarray, None] = None,
+        chunk: int = 8,
+) -> np.ndarray:
+    """
+    Combine the pos and neg halfs of each NC4 signal together.
+
+    The negative half is shifted by its lag to the positive half and the\
+        two are averaged, a chunk of rows at a time.
+
+    Args:
+        prad: Array of radius values for positive half of signal.
+        nrad: Array of radius values for negative half of signal.
+        out: Optional array to write the combined radius into, can be\
+            `prad` to combine in place.
+        chunk: Number of rows to combine at a time.
+
+    Returns:
+        Array of combined radius signal
+    """
+    prad = np.atleast_2d(np.asarray(prad, dtype=float))
+    nrad = np.atleast_2d(np.asarray(nrad, dtype=float))
+    lag = batch_shift(prad, nrad, demean=True)
+    if out is None:
+        out = np.empty_like(prad)
+    for i in range(0, len(prad), chunk):
+        rows = slice(i, i + chunk)
+        radii = gather_rows(nrad[rows], lag[rows])
+        radii += prad[rows]
+        radii /= 2
+        out[rows] = radii
+    return out
+
+
+def fit_circles(
+        radius: np.ndarray,
+        theta: np.ndarray,
+        method: str = 'hyper',
+        chunk: int = 64,
+        max_iter: int = 99,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fit a circle to each radius measurement with an algebraic fit.
+
+    The moments of every measurement are calculated at once, from the\
+        radius and the shared angle of each sample, then the fits are\
+        solved together. The 'hyper' method matches `circle_fit.hyper_fit`.
+
+    Args:
+        radius: Array of radius measurements, (measurements x samples).
+        theta: Angle of each sample around the circumference. (rad)
+        method: Circle fit to use, 'hyper', 'taubin' or 'kasa'.
+        chunk: Number of measurements to calculate moments for at a time.
+        max_iter: Maximum iterations of the Newton root finding.
+
+    Returns:
+        Tuple of the x and y coords of each circle centre and its radius.
+    """
+    if method not in ('hyper', 'taubin', 'kasa'):
+        raise ValueError(f'Unknown circle fit method: {method}')
+    radius = np.atleast_2d(radius)
+    sin = np.sin(theta)
+    cos = np.cos(theta)
+
+    m = np.empty((8, len(radius)))
+    for i in range(0, len(radius), chunk):
+        rad = np.asarray(radius[i:i + chunk], dtype=np.float64)
+        x = rad * sin
+        y = rad * cos
+        xm = x.mean(axis=1)
+        ym = y.mean(axis=1)
+        x -= xm[:, np.newaxis]
+        y -= ym[:, np.newaxis]
+        z = x * x + y * y
+        m[:, i:i + chunk] = [xm,
+                             ym,
+                             (x * y).mean(axis=1),
+                             (x * x).mean(axis=1),
+                             (y * y).mean(axis=1),
+                             (x * z).mean(axis=1),
+                             (y * z).mean(axis=1),
+                             (z * z).mean(axis=1),
+                             ]
+    xm, ym, mxy, mxx, myy, mxz, myz, mzz = m
+
+    mz = mxx + myy
+    cov_xy = mxx * myy - mxy * mxy
+    if method == 'kasa':
+        det = 2 * cov_xy
+        xc = (mxz * myy - myz * mxy) / det
+        yc = (myz * mxx - mxz * mxy) / det
+        return xc + xm, yc + ym, np.sqrt(xc ** 2 + yc ** 2 + mz)
+
+    # coefficients of the characteristic polynomial, A3 x^3 + ... + A0
+    var_z = mzz - mz * mz
+    a3 = 4 * mz if method == 'taubin' else np.zeros_like(mz)
+    a2 = -3 * mz * mz - mzz
+    if method == 'hyper':
+        a2 += 4 * cov_xy
+    a1 = var_z * mz + 4. * cov_xy * mz - mxz * mxz - myz * myz
+    a0 = (mxz * (mxz * myy - myz * mxy)
+          + myz * (myz * mxx - mxz * mxy)
+          - var_z * cov_xy)
+    a4 = 4. if method == 'hyper' else 0.
+
+    # Newton's method for the root of each polynomial, starting at zero
+    x = np.zeros_like(a0)
+    y = a0.copy()
+    active = np.ones(len(x), dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(max_iter):
+            dy = a1 + x * (2 * a2 + x * (3 * a3 + 4 * a4 * x))
+            xnew = x - y / dy
+            active &= (xnew != x) & np.isfinite(xnew)
+            ynew = a0 + xnew * (a1 + xnew * (a2 + xnew * (a3 + a4 * xnew)))
+            active &= np.abs(ynew) < np.abs(y)
+            if not active.any():
+                break
+            x = np.where(active, xnew, x)
+            y = np.where(active, ynew, y)
+
+    det = x * x - x * mz + cov_xy
+    xc = (mxz * (myy - x) - myz * mxy) / det / 2.
+    yc = (myz * (mxx - x) - mxz * mxy) / det / 2.
+    return xc + xm, yc + ym, np.sqrt(np.abs(xc ** 2 + yc ** 2 + mz))
+
+
+def circle_features(
+        radius: np.ndarray,
+        theta: np.ndarray,
+        method: str = 'hyper',
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fit a circle to each NC4 measurement and return its properties.
+
+    Args:
+        radius: Array of radius measurements, (measurements x samples).
+        theta: Angle of each sample around the circumference. (rad)
+        method: Circle fit to use, see `fit_circles`.
+
+    Returns:
+        Tuple of the mean radius, peak radius, runout and form error of each\
+            measurement.
+    """
+    radius = np.atleast_2d(radius)
+    xc, yc, mean_radius = fit_circles(radius, theta, method)
+    runout = 2 * np.sqrt(xc ** 2 + yc ** 2)
+    peak_radius = np.max(radius, axis=1)
+    form_error = peak_radius - np.min(radius, axis=1)
+    return mean_radius, peak_radius, runout, form_error
+
+
+def roundness_harmonics(
+        radius: np.ndarray,
+        nharm: int = 15,
+        upr: int = 50,
+        chunk: int = 64,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Harmonic analysis of the roundness of each NC4 measurement.
+
+    Each measurement is one revolution, so harmonic k of its rfft is k\
+        undulations per revolution (UPR). Measurements are transformed a\
+        chunk at a time, and the filtered profile is rebuilt from the same\
+        spectrum on a grid just fine enough to resolve the cutoff.
+
+    Args:
+        radius: Array of radius measurements, (measurements x samples).
+        nharm: Number of harmonics to return the amplitude of.
+        upr: Cutoff of the form error filter, in UPR.
+        chunk: Number of measurements to transform at a time.
+
+    Returns:
+        Tuple of the amplitude of harmonics 0 to `nharm`, (measurements x\
+            nharm + 1), where harmonic 0 is the mean radius, and the form\
+            error of each measurement with harmonics 2 to `upr` only.
+    """
+    nsamples = np.shape(radius)[-1]
+    nfreq = nsamples // 2 + 1
+    nharm = min(nharm, nfreq - 1)
+    upr = min(upr, nfreq - 1)
+    # 16 points per undulation is enough to find the peak to valley
+    ngrid = min(nsamples, fft.next_fast_len(16 * max(upr, 1)))
+
+    amp = np.empty((len(radius), nharm + 1))
+    form_error = np.empty(len(radius))
+    for i in range(0, len(radius), chunk):
+        rad = np.atleast_2d(np.asarray(radius[i:i + chunk], dtype=np.float64))
+        spec = fft.rfft(rad, axis=1, workers=-1)
+        amp[i:i + len(rad)] = np.abs(spec[:, :nharm + 1]) * (2 / nsamples)
+
+        band = np.zeros((len(rad), ngrid // 2 + 1), dtype=spec.dtype)
+        band[:, 2:upr + 1] = spec[:, 2:upr + 1]
+        profile = fft.irfft(band, n=ngrid, axis=1, workers=-1)
+        form_error[i:i + len(rad)] = np.ptp(profile, axis=1) * (ngrid
+                                                                / nsamples)
+    amp[:, 0] /= 2
+    return amp, form_error
@@ -12,46 +12,27 @@
 
 import os
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+from functools import partial
+from pathlib import Path
 from typing import Any, Union
 from nptdms import TdmsFile
 from numpy import ndarray
 from tqdm import tqdm
 import numpy as np
 import multiprocessing
-import math
-from scipy.ndimage.filters import uniform_filter1d
-from scipy import signal
-import circle_fit
 import matplotlib.pyplot as plt
 import mplcursors
 import pickle
 import pandas as pd
 
 from .. import config
+from . import kernels
+from .radius import Radius
+from .runout import nc4_runout
 
 HOME_DIR, BASE_DIR, CODE_DIR, TB_DIR, RMS_DATA_DIR = config.config_paths()
 
 
-def compute_shift(zipped: tuple[Any, Any]) -> int:
-    """
-    Use fft correlation to compute the shift between two signals.
-
-    Args:
-        zipped: Zip tuple containing the signals to compare between each other.
-
-    Returns:
-        Int representing the number of samples of shift between the signals.
-    """
-    x = zipped[0]
-    y = zipped[1]
-    assert len(x) == len(y)
-    c = signal.correlate(x, y, mode='same', method='fft')
-    assert len(c) == len(x)
-    zero_index = int(len(x) / 2) - 1
-    shift = zero_index - np.argmax(c)
-    return shift
-
-
 class NC4:
     def __init__(
             self,
@@ -76,11 +57,28 @@ class NC4:
         self.runout = pd.Series(np.nan, index=np.arange(len(files)))
         self.peak_radius = pd.Series(np.nan, index=np.arange(len(files)))
         self.mean_radius = pd.Series(np.nan, index=np.arange(len(files)))
+        self.roundness = None
         self._files = files
         self._dcb = dcb
         self._fs = fs
         self._datano = np.arange(0, len(files))
         self._testinfo = testinfo
+        self._chain = None
+
+    def __setstate__(self, state: dict) -> None:
+        # older pickles store the radius as a float64 array
+        radius = state.get('radius')
+        if isinstance(radius, np.ndarray) and radius.ndim == 2:
+            state['radius'] = Radius(radius)
+        self.__dict__.update(state)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        chain = state.get('_chain')
+        if chain is not None and chain.get('last_path') is not None:
+            # the last measurement is reloaded from its file when needed
+            state['_chain'] = {k: v for k, v in chain.items() if k != 'last'}
+        return state
 
     def readNC4(self, fno: int) -> list[float]:
         """
@@ -105,74 +103,200 @@ class NC4:
             ) + prop.get('Offset')
         return data
 
-    def process(self) -> None:
+    def process(
+            self,
+            incremental: bool = True,
+            tail_range: bool = False,
+    ) -> None:
         """
         Function to process the NC4 data from a voltage to radius and \
             compute features.
+
+        Args:
+            incremental: Option to only process files added since the last\
+                call, aligning them to the stored tail of the alignment\
+                chain and appending their results. Everything is reprocessed\
+                if any earlier file has changed.
+            tail_range: Option to normalise each file to the range of the\
+                scan at its end, so the lead-in is never read.
         """
-        # print('Processing NC4 data...')
-        # st1 = time.time()
-        with multiprocessing.Pool() as pool:
-            results = list(tqdm(pool.imap(
-                self._sampleandpos,
-                range(len(self._files)),
-                chunksize=10),
-                total=len(self._files),
-                desc='NC4- Sampling'))
-        pool.close()
-        # en = time.time()
-        # print(f'Sampling done {en - st1:.1f} s...')
-
-        psample = [tple[0] for tple in results]
-        posy = ([tple[1] for tple in results])
-        nsample = [tple[2] for tple in results]
-        negy = ([tple[3] for tple in results])
-
-        p = zip(psample, posy)
-        n = zip(nsample, negy)
-
-        # st = time.time()
-        prad, nrad = self.sigtorad(p, n)
-        # en = time.time()
-        # print(f'Converting done {en - st:.1f} s...')
+        stats = [self._file_stat(fno) for fno in range(len(self._files))]
+        chain = getattr(self, '_chain', None)
+        if (not incremental or chain is None
+                or chain['files'] != stats[:len(chain['files'])]):
+            chain = None
+        n_done = 0 if chain is None else len(chain['files'])
+        fnos = range(n_done, len(self._files))
+        if not fnos:
+            return
+        if chain is not None and 'last' not in chain:
+            chain['last'] = np.load(CODE_DIR.joinpath(chain['last_path']))
+
+        sample = partial(self._sampleandpos, tail_range=tail_range)
+        if len(fnos) == 1:
+            results = [sample(fnos[0])]
+        else:
+            with multiprocessing.Pool() as pool:
+                results = list(tqdm(pool.imap(
+                    sample,
+                    fnos,
+                    chunksize=10),
+                    total=len(fnos),
+                    desc='NC4- Sampling'))
+            pool.close()
 
-        # st = time.time()
-        radii = self._alignposneg(prad, nrad)
-        radius = self._alignsigs(radii)
-        self.radius = radius
-        # en = time.time()
-        # print(f'Aligning done {en - st:.1f} s...')
+        psample = np.array([tple[0] for tple in results])
+        posy = np.array([tple[1] for tple in results])
+        nsample = np.array([tple[2] for tple in results])
+        negy = np.array([tple[3] for tple in results])
+
+        p = (psample, posy)
+        n = (nsample, negy)
+
+        prad, nrad = self.sigtorad(p, n)
+        radii = self._alignposneg(prad, nrad, out=prad)
+        del nrad
+        radius, self._chain = self._alignsigs(radii, chain)
+        self._chain['files'] = stats
 
-        # st = time.time()
         mean_radius, peak_radius, runout, form_error = self._fitcircles(radius)
+        if chain is not None:
+            if not isinstance(self.radius, Radius):
+                self.radius = Radius(self.radius)
+            self.radius.append(radius)
+            radius = self.radius
+            # trim to the chain, check_last can write results past its end
+            mean_radius = np.concatenate(
+                (self.mean_radius.to_numpy()[:n_done], mean_radius))
+            peak_radius = np.concatenate(
+                (self.peak_radius.to_numpy()[:n_done], peak_radius))
+            runout = np.concatenate((self.runout.to_numpy()[:n_done], runout))
+            form_error = np.concatenate(
+                (self.form_error.to_numpy()[:n_done], form_error))
+        self.radius = radius if chain is not None else Radius(radius)
         self.mean_radius = pd.Series(mean_radius)
         self.peak_radius = pd.Series(peak_radius)
         self.runout = pd.Series(runout)
         self.form_error = pd.Series(form_error)
-        # en = time.time()
-        # print(f'Calc results done {en - st:.1f} s...')
-        # print(f'Total time: {en - st1:.1f} s')
+
+        roundness = getattr(self, 'roundness', None)
+        if chain is not None and roundness is not None:
+            new = self._roundness(radius[len(roundness):],
+                                  **roundness.attrs,
+                                  )
+            self.roundness = pd.concat((roundness, new), ignore_index=True)
+            self.roundness.attrs = new.attrs
+        else:
+            self.calc_roundness()
+
+    def calc_roundness(self, nharm: int = 15, upr: int = 50) -> pd.DataFrame:
+        """
+        Harmonic roundness analysis of every NC4 measurement.
+
+        Args:
+            nharm: Number of harmonics to tabulate the amplitude of.
+            upr: Cutoff of the filtered form error, in undulations per\
+                revolution.
+
+        Returns:
+            DataFrame of the roundness of each measurement, also stored as\
+                `roundness`.
+        """
+        self.roundness = self._roundness(self.radius, nharm, upr)
+        return self.roundness
+
+    def _roundness(
+            self,
+            radius: Union[np.ndarray, Radius],
+            nharm: int = 15,
+            upr: int = 50,
+    ) -> pd.DataFrame:
+        """
+        Tabulate the roundness harmonics of some radius measurements.
+
+        Eccentricity and ovality are the amplitudes of harmonics 1 and 2,\
+            lobing is the largest amplitude from harmonic 3 to `nharm` and\
+            lobes its harmonic number. The filtered form error is the peak\
+            to valley of the profile from harmonics 2 to `upr`.
+
+        Args:
+            radius: Array of radius measurements, (measurements x samples).
+            nharm: Number of harmonics to tabulate the amplitude of.
+            upr: Cutoff of the filtered form error, in undulations per\
+                revolution.
+
+        Returns:
+            DataFrame of the roundness of each measurement.
+        """
+        if nharm < 3:
+            raise ValueError('At least 3 harmonics are needed for lobing.')
+        amp, form_error = kernels.roundness_harmonics(radius, nharm, upr)
+        lobes = np.argmax(amp[:, 3:], axis=1) + 3
+        df = pd.DataFrame({
+            'Eccentricity': amp[:, 1],
+            'Ovality': amp[:, 2],
+            'Lobes': lobes.astype(np.int16),
+            'Lobing': amp[np.arange(len(amp)), lobes],
+            'Filtered form error': form_error,
+        })
+        for k in range(3, amp.shape[1]):
+            df[f'H{k}'] = amp[:, k]
+        df = df.astype({c: np.float32 for c in df.columns if c != 'Lobes'})
+        df.attrs = {'nharm': nharm, 'upr': upr}
+        return df
+
+    def save_radius(self) -> None:
+        """
+        Save the radius matrix to its own file next to the experiment, so\
+            it is memory-mapped rather than pickled with the experiment.
+
+        The last unaligned measurement of the alignment chain is saved next\
+            to it and also left out of the pickle.
+        """
+        if not isinstance(self.radius, Radius) or not len(self.radius):
+            return
+        folder = Path(self._testinfo.dataloc)
+        self.radius.save(folder.joinpath(
+            f'Test {self._testinfo.testno} - NC4 Radius.npy'
+        ))
+
+        chain = getattr(self, '_chain', None)
+        if chain is None or 'last' not in chain:
+            return
+        path = folder.joinpath(
+            f'Test {self._testinfo.testno} - NC4 Chain.npy'
+        )
+        if chain.get('last_path') == str(path):
+            return
+        filepath = Path(CODE_DIR.joinpath(path))
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = filepath.with_suffix(f'.npy.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, chain['last'])
+        os.replace(tmp_path, filepath)
+        chain['last_path'] = str(path)
+
+    def _file_stat(self, fno: int) -> tuple[str, int, int]:
+        """Path, size and modification time of an NC4 file."""
+        st = os.stat(CODE_DIR.joinpath(self._files[fno]))
+        return str(self._files[fno]), st.st_size, st.st_mtime_ns
 
     def check_last(self):
+        """
+        Quick check of the runout and wear from the last NC4 file, using the\
+            single file path in `runout.nc4_runout`. The first file is only\
+            calculated once, as the reference for the wear.
+        """
         def _compute_nc4(fno):
-            psample, posy, nsample, negy = self._sampleandpos(fno=fno)
-            prad = self.polyvalradius((psample, posy))
-            nrad = self.polyvalradius((nsample, negy))
-            prad = np.transpose(np.reshape(prad, (-1, 1)))
-            nrad = np.transpose(np.reshape(nrad, (-1, 1)))
-            radii = self._alignposneg(prad, nrad)
-            st = np.argmin(radii[0, 0:int(self._fs)])
-            rpy = 4
-            clip = 0.5
-            radius = radii[
-                :, np.arange(
-                    st, st + (radii.shape[1]) / (rpy - (2 * clip)), dtype=int
-                )
-            ]
-            mean_radius, peak_radius, runout, form_error = self._fitcircles(
-                radius
-            )
-            return mean_radius, peak_radius, runout, form_error
+            atts = nc4_runout(CODE_DIR.joinpath(self._files[fno]),
+                              self._fs,
+                              self._dcb.diameter,
+                              )
+            return (atts['mean_radius'],
+                    atts['peak_radius'],
+                    atts['runout'],
+                    atts['form_error'],
+                    )
 
         self.theta = 2 * np.pi * np.arange(0, 1, 1 / self._fs)
 
@@ -185,11 +309,11 @@ class NC4:
 
         index = len(self._files) - 1
         if index > 0:
-            mean_rad, peak_rad, runout, form_error = _compute_nc4(fno=index)
-            self.mean_radius[index] = mean_rad[0]
-            self.peak_radius[index] = peak_rad[0]
-            self.runout[index] = runout[0]
-            self.form_error[index] = form_error[0]
+            (self.mean_radius[index],
+             self.peak_radius[index],
+             self.runout[index],
+             self.form_error[index]
+             ) = _compute_nc4(fno=index)
 
         wear = (self.mean_radius.iloc[-1] - self.mean_radius.iloc[0])
         wear = wear / self.mean_radius.iloc[0] * 100
@@ -394,79 +518,45 @@ class NC4:
 
     def _sampleandpos(
             self,
-            fno: int
+            fno: int,
+            tail_range: bool = False,
     ) -> tuple[list, list, list, list]:
         """
         Load in NC4 voltage data and select most appropriate section of \
             the signal to carry forward.
 
+        Only the scan at the end of the file is read in full, the lead-in\
+            is streamed in chunks to find the normalisation range, or\
+            skipped when `tail_range` is set.
+
         Args:
             fno: File number to sample from.
+            tail_range: Option to normalise to the range of the scan only.
 
         Returns:
             A tuple containing the signal sample and y position for both the \
                 positive and negative signal.
         """
-        data = self.readNC4(fno)
-        filt = 50
-        scale = 1
-        ysteps = np.around(np.arange(0.04, -0.02, -0.01), 2)
-        rpy = 4
-        spr = 1
-        clip = 0.5
-        gap = 0.4
-        ts = 1 / self._fs
-        gapsamples = int(gap / ts)
-        nosections = int(2 * len(ysteps))
-        lentime = float(nosections) * rpy * spr + gap
-        lensamples = int(lentime / ts)
-        seclensamples = math.ceil(rpy * spr / ts)
-        vs = math.ceil((clip * spr) / ts) - 1
-        ve = int(seclensamples - ((clip * spr) / ts)) - 1
-
-        vfilter = uniform_filter1d(data, size=filt)
-        if scale == 1:
-            datarange = (np.amax(vfilter), np.amin(vfilter))
-            voltage = 5 * (
-                (vfilter - datarange[1]) / (datarange[0] - datarange[1])
-            )
-        else:
-            voltage = vfilter
-
-        voltage = voltage[-(lensamples + 1):]
-        vsec = np.empty(shape=(nosections, seclensamples), dtype=object)
-        for sno in range(nosections):
-            if sno <= (nosections - 1) / 2:
-                vsec[sno][:] = voltage[
-                    (sno * seclensamples):((sno + 1) * seclensamples)
-                ]
-            else:
-                # check if padding required
-                if ((sno + 1) * seclensamples + gapsamples) > len(voltage):
-                    pad_n = (
-                        ((sno + 1) * seclensamples + gapsamples) - len(voltage)
-                    )
-                    voltage = np.pad(voltage, (0, pad_n), 'constant')
-                    
-                vsec[sno][:] = voltage[
-                    ((sno * seclensamples) + gapsamples):
-                    (((sno + 1) * seclensamples) + gapsamples)
-                ]
-
-        vsample = vsec[:, vs:ve]
-        voff = np.sum((vsample - 2.5) ** 2, axis=1)
-
-        psec = np.argmin(voff[0:math.ceil((nosections - 1) / 2)])
-        psample = vsample[:][psec]
-        posy = ysteps[psec]
-
-        nsec = np.argmin(voff[math.ceil((nosections - 1) / 2):])
-        nsample = vsample[:][nsec + math.ceil((nosections - 1) / 2)]
-        negy = ysteps[nsec]
-        # print(f'Completed File {fno}...')
-        return psample, posy, nsample, negy
-
-    def polyvalradius(self, x: tuple[np.ndarray, float]) -> list[float]:
+        filepath = CODE_DIR.joinpath(self._files[fno])
+        with TdmsFile.open(filepath) as tdms:
+            prop = tdms.properties
+            channel = tdms.groups()[-1].channels()[-1]
+
+            def read(offset: int, length: int) -> np.ndarray:
+                data = channel.read_data(offset=offset, length=length)
+                if not data.dtype == float:
+                    data = (
+                        data.astype(np.float64) * prop.get('Gain')
+                    ) + prop.get('Offset')
+                return data
+
+            return kernels.tail_sampleandpos(read,
+                                             len(channel),
+                                             self._fs,
+                                             tail_range,
+                                             )
+
+    def polyvalradius(self, x: tuple[np.ndarray, float]) -> np.ndarray:
         """
         Convert NC4 voltage signal to radius, using NC4 calibration constants.
 
@@ -474,46 +564,41 @@ class NC4:
             x: Tuple containing the signal sample and its y position.
 
         Returns:
-            List of converting values to radius.
+            Array of converting values to radius.
         """
-        pval = [-0.000341717477186167,
-                0.00459433449011791,
-                -0.0237307202784755,
-                0.0585315537400639,
-                -0.0766338436136931,
-                5.15045955887124
-                ]
+        return kernels.polyval_radius(x[0], x[1], self._dcb.diameter)
 
-        d = self._dcb.diameter
-        rad = np.polyval(pval, x[0]) - 5.1 + (d / 2) + x[1]
-        return rad
-
-    def sigtorad(self, p: Any, n: Any) -> tuple[list[float], list[float]]:
+    def sigtorad(
+            self,
+            p: tuple[np.ndarray, np.ndarray],
+            n: tuple[np.ndarray, np.ndarray],
+            lut: bool = False,
+    ) -> tuple[np.ndarray, np.ndarray]:
         """
-        Multiprocessing function to convert signals to radius.
+        Convert the stacked NC4 signals to radius.
 
         Args:
-            p: Zip containing postive NC4 signal and the y position.
-            n: Zip containing negative NC4 signal and the y position.
+            p: Tuple of the postive NC4 signals (signals x samples) and the\
+                y position of each.
+            n: Tuple of the negative NC4 signals and the y position of each.
+            lut: Option to use a lookup table of the calibration, see\
+                `kernels.radius_lut`.
 
         Returns:
-            Tuple containing a list of the converted postive signal and \
-                converted negative signal.
-        """
-        # Converting to Radii rather then Voltage
-        with multiprocessing.Pool() as pool:
-            prad = list(tqdm(pool.imap(self.polyvalradius, p, chunksize=10),
-                             total=len(self._files),
-                             desc='NC4- Conv pos'))
-            nrad = list(tqdm(pool.imap(self.polyvalradius, n, chunksize=10),
-                             total=len(self._files),
-                             desc='NC4- Conv neg'))
-        pool.close()
+            Tuple containing the converted postive signals and converted \
+                negative signals.
+        """
+        d = self._dcb.diameter
+        table = kernels.radius_lut(d) if lut else None
+        prad = kernels.polyval_radius(p[0], p[1], d, lut=table)
+        nrad = kernels.polyval_radius(n[0], n[1], d, lut=table)
         return prad, nrad
 
     @staticmethod
     def _alignposneg(prad: Union[list, np.ndarray],
-                     nrad: Union[list, np.ndarray]
+                     nrad: Union[list, np.ndarray],
+                     out: Union[np.ndarray, None] = None,
+                     chunk: int = 8,
                      ) -> np.ndarray:
         """
         Combine the pos and neg halfs of the signal together.
@@ -521,107 +606,78 @@ class NC4:
         Args:
             prad: Array of radius values for positive half of signal.
             nrad: Array of radius values for negative half of signal.
+            out: Optional array to write the combined radius into, can be\
+                `prad` to combine in place.
+            chunk: Number of rows to combine at a time.
 
         Returns:
             Array of combined radius signal
         """
-        pradzero = np.subtract(np.transpose(prad), np.mean(prad, axis=1))
-        nradzero = np.subtract(np.transpose(nrad), np.mean(nrad, axis=1))
-        # print('Working out Lags')
-        radzeros = list(zip(np.transpose(pradzero), np.transpose(nradzero)))
-        if len(radzeros) == 1:
-            lag = [compute_shift(radzeros[0])]
-        else:
-            with multiprocessing.Pool() as pool:
-                lag = list(tqdm(pool.imap(
-                    compute_shift,
-                    radzeros,
-                    chunksize=10),
-                    total=len(radzeros),
-                    desc='NC4- Merge pn'))
-            pool.close()
-        # print('Finished lags')
-        nrad = np.array([np.roll(row, -x) for row, x in zip(nrad, lag)])
-        radii = np.array([(p + n) / 2 for p, n in zip(prad, nrad)])
-        # print('Calculated radii')
-        return radii
+        return kernels.align_posneg(prad, nrad, out, chunk)
 
-    def _alignsigs(self, radii: np.ndarray) -> np.ndarray:
+    def _alignsigs(
+            self,
+            radii: np.ndarray,
+            chain: Union[dict, None] = None,
+    ) -> tuple[np.ndarray, dict]:
         """
         Shift radius signals so that they align with each other.
 
+        Each measurement is shifted by the cumulative lag between it and\
+            the previous one, so new measurements can be aligned from the\
+            tail of the chain without redoing the earlier ones.
+
         Args:
             radii: Array containing radius vector for each measurement.
+            chain: Alignment chain of previously processed measurements, to\
+                continue from, or None to start a new chain.
 
         Returns:
-            Aligned radius array.
-        """
-        radzero = radii - radii.mean(axis=1, keepdims=True)
-        radzeros = zip(radzero, np.roll(radzero, -1, axis=0))
-        with multiprocessing.Pool() as pool:
-            lags = list(tqdm(pool.imap(compute_shift, radzeros, chunksize=10),
-                             total=len(self._files),
-                             desc='NC4- Aln sigs'))
-        pool.close()
-
-        dly = np.cumsum(lags)
-        dly = np.roll(dly, 1)
-        dly[0] = 0
-        radii = np.array([np.roll(row, -x) for row, x in zip(radii, dly)])
+            Tuple of the aligned radius array, and the alignment chain with\
+                the delay of each measurement, the start of the revolution\
+                and the last unaligned measurement.
+        """
+        lags = kernels.batch_shift(radii[:-1], radii[1:], demean=True)
+        if chain is None:
+            dly = np.cumsum(np.concatenate(([0], lags))).astype(int)
+        else:
+            lag = kernels.batch_shift(chain['last'], radii[0], demean=True)
+            dly = np.cumsum(np.concatenate(([chain['dly'][-1]], lag, lags)))
+            dly = np.concatenate((chain['dly'], dly[1:].astype(int)))
+        new_dly = dly[len(dly) - len(radii):]
+
         self.theta = 2 * np.pi * np.arange(0, 1, 1 / self._fs)
-        st = np.argmin(radii[0, 0:int(self._fs)])
+        if chain is None:
+            row = kernels.gather_rows(radii[:1], new_dly[:1],
+                                      length=int(self._fs))
+            st = int(np.argmin(row))
+        else:
+            st = chain['st']
+        chain = {'dly': dly, 'st': st, 'last': radii[-1].copy()}
         rpy = 4
         clip = 0.5
-        radius = radii[
-            :,
-            np.arange(
-                st, st + (radii.shape[1]) / (rpy - (2 * clip)), dtype=int
-            )
-        ]
-        # self.radius = radius
-        return radius
+        length = len(np.arange(
+            st, st + (radii.shape[1]) / (rpy - (2 * clip)), dtype=int
+        ))
+        radius = kernels.gather_rows(radii, new_dly, start=st, length=length)
+        return radius, chain
 
     def _fitcircles(self,
-                    radius: np.ndarray
+                    radius: np.ndarray,
+                    method: str = 'hyper',
                     ) -> tuple[ndarray, ndarray, ndarray, ndarray]:
         """
         Fit a circle to each NC4 measurements and return its properties.
 
         Args:
             radius: Array of radius to calc attributes for
+            method: Algebraic circle fit to use, 'hyper', 'taubin' or 'kasa'.
 
         Returns:
-            List of tuples containing the x and y coords, the radius of the \
-                circle and the variance.
-        """
-        theta = self.theta
-        x = np.array([np.multiply(r, np.sin(theta)) for r in radius])
-        y = np.array([np.multiply(r, np.cos(theta)) for r in radius])
-        xy = np.array(list(zip(x, y))).transpose([0, 2, 1])
-        if len(x) == 1:
-            circle = [circle_fit.hyper_fit(xy[0])]
-        else:
-            with multiprocessing.Pool() as pool:
-                circle = list(tqdm(pool.imap(
-                    circle_fit.hyper_fit,
-                    xy,
-                    chunksize=10),
-                    total=len(xy),
-                    desc='NC4- Calc att'))
-            pool.close()
-        runout = np.array(
-            [2 * (np.sqrt(x[0] ** 2 + x[1] ** 2)) for x in circle]
-        )
-        mean_radius = np.array(
-            [x[2] for x in circle]
-        )
-        peak_radius = np.array(
-            [np.max(rad) for rad in radius]
-        )
-        form_error = np.array(
-            [(np.max(rad) - np.min(rad)) for rad in radius]
-        )
-        return mean_radius, peak_radius, runout, form_error
+            Tuple of the mean radius, peak radius, runout and form error of\
+                each measurement.
+        """
+        return kernels.circle_features(radius, self.theta, method)
 
     def update(self, files: Union[list[str], tuple[str]]) -> None:
         """
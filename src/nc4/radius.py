@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+"""
+Compact storage of NC4 radius.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Union
+
+import numpy as np
+
+from .. import config
+
+HOME_DIR, BASE_DIR, CODE_DIR, TB_DIR, RMS_DATA_DIR = config.config_paths()
+
+
+class Radius:
+    def __init__(self, data: Any = None) -> None:
+        """
+        Matrix of NC4 radius measurements, (measurements x samples).
+
+        Each measurement is stored as its mean in float64 and its deviation\
+            from the mean in float32, halving the size without losing\
+            precision on the form. Indexing returns float64 radius. The\
+            deviations can be saved to a `.npy` file next to the experiment,\
+            after which only the path is pickled and the file is\
+            memory-mapped the first time the radius is used.
+
+        Args:
+            data: Initial radius matrix.
+        """
+        self.path = None
+        self._n = 0
+        self._means = np.empty(0)
+        self._dev = np.empty((0, 0), dtype=np.float32)
+        self._dirty = False
+        if data is not None and len(data):
+            self.append(data)
+
+    @property
+    def means(self) -> np.ndarray:
+        """Mean radius of each measurement."""
+        return self._means[:self._n]
+
+    @property
+    def dev(self) -> np.ndarray:
+        """Deviation of each measurement from its mean, (float32)."""
+        if self._dev is None:
+            self._dev = np.load(CODE_DIR.joinpath(self.path), mmap_mode='r')
+        return self._dev[:self._n]
+
+    @property
+    def shape(self) -> tuple:
+        return self._n, self.dev.shape[1]
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, item: Any) -> np.ndarray:
+        if isinstance(item, tuple):
+            rows, cols = item[0], item[1:]
+        else:
+            rows, cols = item, ()
+        dev = self.dev[rows]
+        if cols:
+            dev = dev[(slice(None),) * (dev.ndim - 1) + cols]
+        mean = self.means[rows]
+        if np.ndim(mean) and dev.ndim > np.ndim(mean):
+            mean = mean[:, np.newaxis]
+        return dev.astype(np.float64) + mean
+
+    def __iter__(self) -> Any:
+        for i in range(self._n):
+            yield self[i]
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        out = self[:]
+        return out if dtype is None else out.astype(dtype, copy=False)
+
+    def astype(self, dtype: Any) -> np.ndarray:
+        """Whole radius matrix as an array of `dtype`."""
+        return np.asarray(self, dtype=dtype)
+
+    def append(self, rows: Any) -> None:
+        """
+        Add new measurements to the end of the matrix.
+
+        Args:
+            rows: Radius of a measurement, or 2D array of measurements.
+        """
+        rows = np.asarray(rows, dtype=np.float64)
+        if rows.ndim == 1:
+            rows = rows[np.newaxis]
+        means = rows.mean(axis=1)
+        dev = self.dev
+        if self._n and rows.shape[1] != dev.shape[1]:
+            raise ValueError(f'Measurements have {rows.shape[1]} samples, '
+                             f'expected {dev.shape[1]}.')
+
+        n = self._n + len(rows)
+        if (self.path is not None or n > len(self._dev)
+                or dev.shape[1] != rows.shape[1]):
+            size = max(n, 2 * len(self._dev))
+            new_dev = np.empty((size, rows.shape[1]), dtype=np.float32)
+            if self._n:
+                new_dev[:self._n] = dev
+            new_means = np.empty(size)
+            new_means[:self._n] = self.means
+            self._dev, self._means = new_dev, new_means
+            self.path = None
+        self._means[self._n:n] = means
+        np.subtract(rows, means[:, np.newaxis], out=self._dev[self._n:n],
+                    casting='same_kind')
+        self._n = n
+        self._dirty = True
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write the radius deviations to a `.npy` file and memory-map it.
+
+        Args:
+            path: Location to save the `.npy` file, relative to CODE_DIR.
+        """
+        if self.path == str(path) and not self._dirty:
+            return
+        # load into memory first, so a mapped file isn't held open
+        dev = np.array(self.dev)
+        self._dev = dev
+        filepath = Path(CODE_DIR.joinpath(path))
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = filepath.with_suffix(f'.npy.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, dev)
+        os.replace(tmp_path, filepath)
+        self._means = self.means.copy()
+        self.path = str(path)
+        self._dirty = False
+        self._dev = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_means'] = self.means.copy()
+        if self.path is not None and not self._dirty:
+            state['_dev'] = None
+        else:
+            state['_dev'] = np.ascontiguousarray(self.dev)
+        return state
+
+    def __repr__(self) -> str:
+        return f'Radius({self._n} measurements)'
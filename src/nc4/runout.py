@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+"""
+Quick runout check of one NC4 file.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+from nptdms import TdmsFile
+
+# only the kernels are needed, keep matplotlib and the NC4 class out of this
+# module so machine-side checks import quickly
+from .. import config
+from . import kernels
+
+# first file features, keyed by file, size/mtime and settings
+_REFERENCES = {}
+
+
+def scan_radius(
+        filepath: Union[str, Path],
+        fs: float = 50_000,
+        diameter: float = 1.3,
+        tail_range: bool = False,
+) -> np.ndarray:
+    """
+    Convert a single NC4 scan to radius, with its pos and neg halfs aligned.
+
+    Args:
+        filepath: Path to the NC4 TDMS file.
+        fs: Sample rate of the NC4 acquisition.
+        diameter: Diameter of the DCB. (mm)
+        tail_range: Option to normalise to the range of the scan only,\
+            skipping the lead-in of the file.
+
+    Returns:
+        Combined radius of the scan. (mm)
+    """
+    with TdmsFile.open(filepath) as tdms:
+        prop = tdms.properties
+        channel = tdms.groups()[-1].channels()[-1]
+
+        def read(offset: int, length: int) -> np.ndarray:
+            data = channel.read_data(offset=offset, length=length)
+            if not data.dtype == float:
+                data = (
+                    data.astype(np.float64) * prop.get('Gain')
+                ) + prop.get('Offset')
+            return data
+
+        psample, posy, nsample, negy = kernels.tail_sampleandpos(
+            read, len(channel), fs, tail_range
+        )
+    prad = kernels.polyval_radius(psample, posy, diameter)
+    nrad = kernels.polyval_radius(nsample, negy, diameter)
+    return kernels.align_posneg(prad, nrad)[0]
+
+
+def runout_features(
+        radii: np.ndarray,
+        fs: float = 50_000,
+        method: str = 'hyper',
+) -> dict:
+    """
+    Fit a circle to one revolution of a combined NC4 scan.
+
+    The revolution starts at the minimum radius in the first second of the\
+        scan, as in `NC4.process`.
+
+    Args:
+        radii: Combined radius of the scan, from `scan_radius`.
+        fs: Sample rate of the NC4 acquisition.
+        method: Circle fit to use, see `kernels.fit_circles`.
+
+    Returns:
+        Dict of the mean radius, peak radius, runout and form error.
+    """
+    rpy = kernels.RPY
+    clip = kernels.CLIP
+    st = int(np.argmin(radii[:int(fs)]))
+    length = len(np.arange(st, st + len(radii) / (rpy - (2 * clip)),
+                           dtype=int))
+    theta = 2 * np.pi * np.arange(0, 1, 1 / fs)
+    mean_radius, peak_radius, runout, form_error = kernels.circle_features(
+        radii[st:st + length], theta, method
+    )
+    return {'mean_radius': float(mean_radius[0]),
+            'peak_radius': float(peak_radius[0]),
+            'runout': float(runout[0]),
+            'form_error': float(form_error[0]),
+            }
+
+
+def reference_runout(
+        filepath: Union[str, Path],
+        fs: float = 50_000,
+        diameter: float = 1.3,
+        method: str = 'hyper',
+) -> dict:
+    """
+    Runout features of the first file of a test, cached between calls.
+
+    Results are kept for the life of the process and, if AE_CACHE_DIR is\
+        set, in a small json file in its `nc4` folder, keyed by the file\
+        and its size/mtime so a changed file is recalculated.
+
+    Args:
+        filepath: Path to the NC4 TDMS file.
+        fs: Sample rate of the NC4 acquisition.
+        diameter: Diameter of the DCB. (mm)
+        method: Circle fit to use, see `kernels.fit_circles`.
+
+    Returns:
+        Dict of the mean radius, peak radius, runout and form error.
+    """
+    st = os.stat(filepath)
+    key = '|'.join(str(k) for k in (os.path.abspath(filepath),
+                                     st.st_size,
+                                     st.st_mtime_ns,
+                                     fs,
+                                     diameter,
+                                     method,
+                                     ))
+    if key in _REFERENCES:
+        return _REFERENCES[key]
+
+    cache_dir, _ = config.cache_config()
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = cache_dir.joinpath('nc4', 'references.json')
+        try:
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+        except (FileNotFoundError, ValueError):
+            cached = {}
+        if key in cached:
+            _REFERENCES[key] = cached[key]
+            return cached[key]
+
+    atts = runout_features(scan_radius(filepath, fs, diameter), fs, method)
+    _REFERENCES[key] = atts
+    if cache_path is not None:
+        cached[key] = atts
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f'.json.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(cached, f)
+        os.replace(tmp_path, cache_path)
+    return atts
+
+
+def nc4_runout(
+        filepath: Union[str, Path],
+        fs: float = 50_000,
+        diameter: float = 1.3,
+        reference: Union[str, Path, dict, None] = None,
+        method: str = 'hyper',
+        tail_range: bool = False,
+) -> dict:
+    """
+    Quick check of the runout and wear of the DCB from one NC4 file.
+
+    Runs the same chain as `NC4.process` for a single file, in process and\
+        without plotting, for checks on the machine between cuts.
+
+    Args:
+        filepath: Path to the NC4 TDMS file.
+        fs: Sample rate of the NC4 acquisition.
+        diameter: Diameter of the DCB. (mm)
+        reference: First file of the test to calculate wear against, either\
+            its path or its features, e.g. from `reference_runout`.
+        method: Circle fit to use, see `kernels.fit_circles`.
+        tail_range: Option to normalise to the range of the scan only,\
+            skipping the lead-in of the file.
+
+    Returns:
+        Dict of the mean radius, peak radius, runout, form error and the\
+            wear as a percentage of the reference mean radius, (nan without\
+            a reference).
+    """
+    atts = runout_features(scan_radius(filepath, fs, diameter, tail_range),
+                           fs,
+                           method,
+                           )
+    if isinstance(reference, (str, Path)):
+        reference = reference_runout(reference, fs, diameter, method)
+    wear = np.nan
+    if reference is not None:
+        ref = reference['mean_radius']
+        wear = (atts['mean_radius'] - ref) / ref * 100
+    atts['wear'] = float(wear)
+    return atts
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+"""
+Benchmark NC4 voltage to radius conversion.
+"""
+import sys, os # noqa
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import multiprocessing
+import time
+from functools import partial
+
+import numpy as np
+
+from src.nc4 import kernels
+
+
+def _pool_row(x: tuple, diameter: float) -> np.ndarray:
+    # original per row conversion, as sent to the pool by NC4.sigtorad
+    return np.polyval(kernels.PVAL, x[0]) - 5.1 + (diameter / 2) + x[1]
+
+
+def pool_sigtorad(p: tuple, n: tuple, diameter: float) -> tuple:
+    """Original conversion, one pool task per row."""
+    func = partial(_pool_row, diameter=diameter)
+    with multiprocessing.Pool() as pool:
+        prad = list(pool.imap(func, zip(*p), chunksize=10))
+        nrad = list(pool.imap(func, zip(*n), chunksize=10))
+    pool.close()
+    return np.array(prad), np.array(nrad)
+
+
+def bench(n_files: int = 300,
+          fs: int = 50_000,
+          diameter: float = 1.3,
+          seed: int = 0,
+          ) -> dict:
+    """
+    Time the pool, vectorised and lookup table radius conversions.
+
+    Args:
+        n_files: Number of measurements to convert.
+        fs: NC4 sample rate, sets the length of each sample.
+        diameter: Diameter of the DCB. (mm)
+        seed: Seed for the random test signals.
+
+    Returns:
+        Dict of the time taken and max difference from the pool version,\
+            for each method.
+    """
+    rng = np.random.default_rng(seed)
+    g = kernels.section_geometry(fs)
+    shape = (n_files, g['ve'] - g['vs'])
+    p = (rng.uniform(1, 4, shape), rng.choice(kernels.YSTEPS, n_files))
+    n = (rng.uniform(1, 4, shape), rng.choice(kernels.YSTEPS, n_files))
+
+    st = time.perf_counter()
+    ref = pool_sigtorad(p, n, diameter)
+    res = {'pool': (time.perf_counter() - st, 0.0)}
+
+    st = time.perf_counter()
+    vec = (kernels.polyval_radius(*p, diameter),
+           kernels.polyval_radius(*n, diameter),
+           )
+    res['vectorised'] = (time.perf_counter() - st,
+                         max(np.abs(a - b).max() for a, b in zip(vec, ref)))
+
+    st = time.perf_counter()
+    lut = kernels.radius_lut(diameter)
+    vec = (kernels.polyval_radius(*p, diameter, lut=lut),
+           kernels.polyval_radius(*n, diameter, lut=lut),
+           )
+    res['lut'] = (time.perf_counter() - st,
+                  max(np.abs(a - b).max() for a, b in zip(vec, ref)))
+    return res
+
+
+if __name__ == '__main__':
+
+    # Common usage:
+    # python testingUtils/bench_polyval.py -n 300
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark NC4 voltage to radius conversion.'
+    )
+    parser.add_argument('-n', '--nfiles',
+                        default=300,
+                        type=int,
+                        help='Number of measurements to convert'
+                        )
+    parser.add_argument('-fs',
+                        default=50_000,
+                        type=int,
+                        help='Sampling frequency of the NC4'
+                        )
+    args = parser.parse_args()
+
+    res = bench(args.nfiles, args.fs)
+    for method, (t, err) in res.items():
+        print(f'{method:>10}: {t:7.3f} s (max diff {err:.2e} mm)')
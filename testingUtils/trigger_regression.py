@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+"""
+Compare the fast AE triggers of stored experiments with their triggers.
+"""
+import sys, os # noqa
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+import src
+
+
+def compare_triggers(exp_name: str,
+                     tol: int = 2_000,
+                     end_tol: Union[int, None] = None,
+                     y_tol: float = 0.1,
+                     recompute: bool = False,
+                     decimate: int = 1_000,
+                     ) -> pd.DataFrame:
+    """
+    Compare the fast trigger mode with the full rate triggers of a test.
+
+    The reference triggers are the ones stored in the experiment obj, unless\
+        there are none or `recompute` is set, in which case they are found\
+        again at full rate.
+
+    Args:
+        exp_name: Name of the test to load, e.g. 'Test 5'.
+        tol: Allowed difference in the start trigger index. (samples)
+        end_tol: Allowed difference in the end trigger index, default\
+            `tol`. (samples)
+        y_tol: Allowed relative difference in the trigger y-value, the fast\
+            y-value reads a few percent high, see `AE._find_triggers`.
+        recompute: Option to recompute the full rate triggers.
+        decimate: Decimation factor for the fast trigger mode.
+
+    Returns:
+        DataFrame of the reference and fast triggers for each file, their\
+            differences and timings.
+    """
+    end_tol = tol if end_tol is None else end_tol
+    exp = src.load(exp_name)
+    ae = exp.ae
+    stored = ae.trig_points
+    recompute = recompute or stored.empty
+
+    rows = []
+    for fno in range(len(ae._files)):
+        sig = ae.read_signal(fno)
+        if recompute:
+            st = time.perf_counter()
+            ref = ae._find_triggers(sig)
+            t_ref = time.perf_counter() - st
+        else:
+            ref = tuple(stored.loc[fno])
+            t_ref = np.nan
+        st = time.perf_counter()
+        fast = ae._find_triggers(sig, fast=True, decimate=decimate)
+        t_fast = time.perf_counter() - st
+        rows.append([fno, *ref, *fast, t_ref, t_fast])
+
+    df = pd.DataFrame(rows, columns=['File',
+                                     'trig st', 'trig end', 'trig y-val',
+                                     'fast st', 'fast end', 'fast y-val',
+                                     'time ref', 'time fast',
+                                     ]).set_index('File')
+    df['diff st'] = df['fast st'] - df['trig st']
+    df['diff end'] = df['fast end'] - df['trig end']
+    df['rel diff y'] = (
+        (df['fast y-val'] - df['trig y-val']) / df['trig y-val']
+    ).fillna(0)
+    df['pass'] = (
+        (df['diff st'].abs() <= tol)
+        & (df['diff end'].abs() <= end_tol)
+        & (df['rel diff y'].abs() <= y_tol)
+    )
+    return df
+
+
+if __name__ == "__main__":
+
+    # Common usage:
+    # python testingUtils/trigger_regression.py "Test 5" "Test 7" -t 2000
+
+    parser = argparse.ArgumentParser(
+        description='Check fast AE triggers against the full rate triggers.'
+    )
+    parser.add_argument('tests',
+                        nargs='+',
+                        type=str,
+                        help='Names of the tests to check, e.g. "Test 5"'
+                        )
+    parser.add_argument('-t', '--tol',
+                        default=2_000,
+                        type=int,
+                        help='Allowed start trigger difference (samples)'
+                        )
+    parser.add_argument('-e', '--endtol',
+                        default=None,
+                        type=int,
+                        help='Allowed end trigger difference (samples), '
+                             'default the same as --tol'
+                        )
+    parser.add_argument('-y', '--ytol',
+                        default=0.1,
+                        type=float,
+                        help='Allowed relative trigger y-value difference'
+                        )
+    parser.add_argument('-d', '--decimate',
+                        default=1_000,
+                        type=int,
+                        help='Decimation factor for the fast triggers'
+                        )
+    parser.add_argument('-r', '--recompute',
+                        action='store_true',
+                        help='Recompute full rate triggers, (and time them)'
+                        )
+    args = parser.parse_args()
+
+    all_pass = True
+    for test in args.tests:
+        res = compare_triggers(test,
+                               tol=args.tol,
+                               end_tol=args.endtol,
+                               y_tol=args.ytol,
+                               recompute=args.recompute,
+                               decimate=args.decimate,
+                               )
+        n_fail = int((~res['pass']).sum())
+        all_pass &= n_fail == 0
+        print('-' * 60)
+        print(f'{test}: {len(res) - n_fail}/{len(res)} files within tolerance')
+        print(f'\tMax |diff st|  = {res["diff st"].abs().max():.0f} samples')
+        print(f'\tMax |diff end| = {res["diff end"].abs().max():.0f} samples')
+        print(f'\tMax |rel diff y| = {res["rel diff y"].abs().max():.3f}, '
+              f'mean rel diff y = {res["rel diff y"].mean():+.3f}')
+        print(f'\tMean time: ref {res["time ref"].mean():.3f} s, '
+              f'fast {res["time fast"].mean():.3f} s')
+        if n_fail:
+            print(res.loc[~res['pass'],
+                          ['diff st', 'diff end', 'rel diff y']])
+    print('-' * 60)
+    sys.exit(0 if all_pass else 1)
@@ -0,0 +1,68 @@
+"""
+Checks of the streaming AE moment accumulator against the scipy features.
+"""
+import numpy as np
+import pytest
+from scipy.stats import kurtosis, skew
+
+from src.ae.ae import AESignal, Moments, rms
+
+N = 3_000_001
+RTOL = 1E-9
+SCALE, OFFSET = 3.05E-5 * 10, 1E-3
+
+
+def _signals() -> dict:
+    rng = np.random.default_rng(0)
+    raw = (rng.standard_normal(N) * 4000).astype(np.int16)
+    return {'normal': rng.normal(0.01, 0.3, N),
+            'burst': rng.standard_t(3, N) * np.hanning(N) + 5,
+            'skewed': rng.exponential(2E-3, N),
+            'int16 scaled': raw,
+            }
+
+
+SIGNALS = _signals()
+
+
+def _volts(name: str) -> np.ndarray:
+    v = SIGNALS[name]
+    return v * SCALE + OFFSET if name == 'int16 scaled' else v
+
+
+def _reference(v: np.ndarray) -> tuple:
+    return kurtosis(v, fisher=False), rms(v), np.max(v), skew(v)
+
+
+def _streamed(m: Moments) -> tuple:
+    return m.kurtosis, m.rms, m.max, m.skew
+
+
+@pytest.mark.parametrize('name', list(SIGNALS))
+def test_chunked(name: str) -> None:
+    v = _volts(name)
+    m = Moments()
+    for c in np.array_split(v, 37):
+        m.update(c)
+    np.testing.assert_allclose(_streamed(m), _reference(v), rtol=RTOL)
+
+
+@pytest.mark.parametrize('name', list(SIGNALS))
+def test_merged_out_of_order(name: str) -> None:
+    # as when combining the results of separate workers
+    v = _volts(name)
+    parts = [Moments.from_array(c) for c in np.array_split(v, 37)]
+    m = Moments()
+    for p in parts[1::2] + parts[::2]:
+        m = m + p
+    np.testing.assert_allclose(_streamed(m), _reference(v), rtol=RTOL)
+
+
+def test_aesignal_deferred_scaling() -> None:
+    sig = AESignal(SIGNALS['int16 scaled'], SCALE, OFFSET,
+                   chunk_size=250_000)
+    res = sig.kurtosis(), sig.rms(), sig.max(), sig.skew()
+    np.testing.assert_allclose(res,
+                               _reference(_volts('int16 scaled')),
+                               rtol=RTOL,
+                               )
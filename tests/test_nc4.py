@@ -0,0 +1,70 @@
+"""
+Checks of incremental NC4 processing against a full run.
+"""
+from types import SimpleNamespace
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+from nptdms import ChannelObject, RootObject, TdmsWriter  # noqa: E402
+
+from src.nc4.nc4 import NC4  # noqa: E402
+
+FS = 50_000
+
+
+@pytest.fixture(scope='module')
+def files(tmp_path_factory: pytest.TempPathFactory) -> list:
+    # 13 sections of 4 s at stepped positions, one revolution per second,
+    # with the phase of the DCB shifting between files
+    folder = tmp_path_factory.mktemp('nc4')
+    rng = np.random.default_rng(3)
+    n = int(52 * FS)
+    t = np.arange(n) / FS
+    sec = np.repeat(np.arange(13), 4 * FS)[:n]
+    base = np.array([0.5, 1.2, 1.9, 2.6, 3.0, 2.2, 0.7,
+                     1.5, 2.4, 2.7, 3.3, 4.0, 4.0])[sec]
+    paths = []
+    for k in range(4):
+        ph = 0.37 * k
+        v = (base + 0.4 * np.sin(2 * np.pi * (t + ph))
+             + 0.05 * np.sin(2 * np.pi * 3 * (t + ph))
+             + rng.normal(0, 0.01, n) - 0.001 * k)
+        path = folder.joinpath(f'nc{k}.tdms')
+        with TdmsWriter(path) as w:
+            w.write_segment([RootObject(properties={'Gain': 1.0,
+                                                    'Offset': 0.0}),
+                             ChannelObject('g', 'c', v),
+                             ])
+        paths.append(str(path))
+    return paths
+
+
+def _nc4(files: list) -> NC4:
+    return NC4(files,
+               SimpleNamespace(testno=1, dataloc=''),
+               SimpleNamespace(diameter=1.3),
+               FS,
+               )
+
+
+def test_incremental_after_check_last(files: list) -> None:
+    full = _nc4(files)
+    full.process(incremental=False)
+
+    inc = _nc4(files[:3])
+    inc.process()
+    inc.update(files)
+    inc.check_last()
+    inc.process()
+
+    assert len(inc.radius) == len(files)
+    for att in ('mean_radius', 'peak_radius', 'runout', 'form_error'):
+        assert len(getattr(inc, att)) == len(files)
+        np.testing.assert_allclose(getattr(inc, att),
+                                   getattr(full, att),
+                                   rtol=1E-9,
+                                   atol=1E-12,
+                                   )
+    assert len(inc.roundness) == len(files)
@@ -0,0 +1,49 @@
+"""
+Regression of the fast decimated AE triggers against the full rate ones.
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.ae.ae import AE, AESignal
+
+FS = 2_000_000
+# tolerance of the fast mode, see AE._find_triggers
+ST_TOL = 2_000
+END_TOL = 500
+Y_TOL = 0.1
+
+
+def _burst(seed: int, st: int, en: int, n: int = 16_000_000) -> AESignal:
+    # low noise either side of a modulated cut, like a recorded AE file
+    rng = np.random.default_rng(seed)
+    amp = np.full(n, 300.0)
+    amp[st:en] = 9000.0 * (1 + 0.3 * np.sin(np.arange(en - st) / 2E5))
+    raw = (rng.standard_normal(n) * amp).astype(np.int16)
+    return AESignal(raw, 3.05E-5, 0.0)
+
+
+@pytest.fixture(scope='module')
+def ae() -> AE:
+    return AE((), SimpleNamespace(gain=40), SimpleNamespace(testno=1), FS)
+
+
+@pytest.mark.parametrize('seed, st, en', [(0, 3_000_000, 12_500_000),
+                                          (3, 2_500_000, 14_000_000),
+                                          ])
+def test_fast_triggers(ae: AE, seed: int, st: int, en: int) -> None:
+    sig = _burst(seed, st, en)
+    ref = ae._find_triggers(sig)
+    fast = ae._find_triggers(sig, fast=True)
+
+    assert abs(ref[0] - st) <= 100_000
+    assert abs(ref[1] - en) <= 100_000
+    assert abs(fast[0] - ref[0]) <= ST_TOL
+    assert abs(fast[1] - ref[1]) <= END_TOL
+    assert abs(fast[2] - ref[2]) / ref[2] <= Y_TOL
+
+
+def test_no_trigger(ae: AE) -> None:
+    sig = _burst(1, 0, 0, n=8_000_000)
+    assert ae._find_triggers(sig, fast=True) == (0, len(sig), 0)